@@ -8,16 +8,25 @@ Uso:
 """
 
 import asyncio
-import json
 import logging
 import sys
 from pathlib import Path
+from typing import List, Optional
 
 # Adiciona raiz do projeto ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from azure.cosmos import CosmosClient, PartitionKey, exceptions
-from src.core.config import get_settings
+from azure.cosmos import PartitionKey, exceptions
+from azure.cosmos.aio import CosmosClient
+from src.core.config import Settings, get_settings
+from src.models.schemas import ComplaintSource
+
+# Parser JSON: orjson lê direto dos bytes; sem ele, cai no json da stdlib
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    # json.loads também aceita bytes (detecta UTF-8 sozinho)
+    from json import loads as json_loads
 
 # Configura logging
 logging.basicConfig(
@@ -26,27 +35,72 @@ logging.basicConfig(
 )
 logger = logging.getLogger("init_cosmos")
 
+# Número máximo de upserts simultâneos ao popular o container de times
+UPSERT_CONCURRENCY = 16
 
-def init_database():
-    """Inicializa database e containers no Cosmos DB."""
-    settings = get_settings()
+# Valores possíveis da partition key (/source) do container de reclamações
+COMPLAINT_PARTITIONS = [source.value for source in ComplaintSource]
 
-    logger.info("=" * 60)
-    logger.info("Iniciando configuração do Azure Cosmos DB")
-    logger.info("=" * 60)
+# Query de contagem compartilhada por todos os containers. Quando a partition
+# key é informada, o SDK envia a query direto para a partição, sem a ida extra
+# ao gateway para obter o query plan. Os partition key ranges (/pkranges) de
+# cada container são buscados uma vez e ficam no routing map do cliente, que é
+# único no script (ver main); as contagens seguintes reaproveitam esse cache.
+COUNT_QUERY = "SELECT VALUE COUNT(1) FROM c"
+
+
+async def _upsert_document(
+    container, document: dict, label: str, semaphore: asyncio.Semaphore
+) -> None:
+    """Salva um documento no container, registrando sucesso ou falha."""
+    async with semaphore:
+        try:
+            await container.upsert_item(document)
+            logger.info(f"✓ {label} salvo")
+        except exceptions.CosmosHttpResponseError as e:
+            logger.warning(f"✗ Falha ao salvar {label}: {e.message}")
 
-    # Conecta ao Cosmos DB
-    logger.info(f"Conectando ao endpoint: {settings.cosmos_endpoint[:50]}...")
 
-    client = CosmosClient(
+async def _create_container(database, container_id: str, partition_path: str):
+    """Cria (ou obtém) um container, registrando sucesso ou falha."""
+    try:
+        container = await database.create_container_if_not_exists(
+            id=container_id,
+            partition_key=PartitionKey(path=partition_path),
+        )
+        logger.info(f"✓ Container '{container_id}' pronto (partition key: {partition_path})")
+        return container
+    except exceptions.CosmosHttpResponseError as e:
+        logger.error(f"✗ Falha ao criar container {container_id}: {e.message}")
+        raise
+
+
+def create_client(settings: Settings) -> CosmosClient:
+    """Cria o cliente Cosmos DB (async) compartilhado pelas etapas do script."""
+    return CosmosClient(
         url=settings.cosmos_endpoint,
         credential=settings.cosmos_key,
     )
 
+
+async def init_database(client: CosmosClient, settings: Settings):
+    """
+    Inicializa database e containers no Cosmos DB.
+
+    Args:
+        client: Cliente Cosmos DB conectado
+        settings: Configurações da aplicação
+    """
+    logger.info("=" * 60)
+    logger.info("Iniciando configuração do Azure Cosmos DB")
+    logger.info("=" * 60)
+
+    logger.info(f"Endpoint: {settings.cosmos_endpoint[:50]}...")
+
     # Cria database
-    logger.info(f"\n[1/4] Criando database '{settings.cosmos_database_name}'...")
+    logger.info(f"\n[1/2] Criando database '{settings.cosmos_database_name}'...")
     try:
-        database = client.create_database_if_not_exists(
+        database = await client.create_database_if_not_exists(
             id=settings.cosmos_database_name
         )
         logger.info(f"✓ Database '{settings.cosmos_database_name}' pronto")
@@ -54,42 +108,15 @@ def init_database():
         logger.error(f"✗ Falha ao criar database: {e.message}")
         raise
 
-    # Cria container de reclamações
+    # Cria os containers em paralelo (só dependem do database)
     # Nota: Não especificar throughput para contas serverless
-    logger.info("\n[2/4] Criando container 'complaints'...")
-    try:
-        complaints_container = database.create_container_if_not_exists(
-            id="complaints",
-            partition_key=PartitionKey(path="/source"),
-        )
-        logger.info("✓ Container 'complaints' pronto (partition key: /source)")
-    except exceptions.CosmosHttpResponseError as e:
-        logger.error(f"✗ Falha ao criar container complaints: {e.message}")
-        raise
-
-    # Cria container de auditoria
-    logger.info("\n[3/4] Criando container 'audit_log'...")
-    try:
-        audit_container = database.create_container_if_not_exists(
-            id="audit_log",
-            partition_key=PartitionKey(path="/date"),
-        )
-        logger.info("✓ Container 'audit_log' pronto (partition key: /date)")
-    except exceptions.CosmosHttpResponseError as e:
-        logger.error(f"✗ Falha ao criar container audit_log: {e.message}")
-        raise
-
-    # Cria container de times (opcional - para cache/lookup rápido)
-    logger.info("\n[4/4] Criando container 'teams'...")
-    try:
-        teams_container = database.create_container_if_not_exists(
-            id="teams",
-            partition_key=PartitionKey(path="/id"),
-        )
-        logger.info("✓ Container 'teams' pronto (partition key: /id)")
-    except exceptions.CosmosHttpResponseError as e:
-        logger.error(f"✗ Falha ao criar container teams: {e.message}")
-        raise
+    logger.info("\n[2/2] Criando containers 'complaints', 'audit_log' e 'teams'...")
+    _, _, teams_container = await asyncio.gather(
+        _create_container(database, "complaints", "/source"),
+        _create_container(database, "audit_log", "/date"),
+        # Container de times (opcional - para cache/lookup rápido)
+        _create_container(database, "teams", "/id"),
+    )
 
     # Popula dados dos times
     logger.info("\n" + "=" * 60)
@@ -99,32 +126,33 @@ def init_database():
     teams_file = Path(__file__).parent.parent / "data" / "mock" / "teams.json"
 
     if teams_file.exists():
-        with open(teams_file, "r", encoding="utf-8") as f:
-            teams_data = json.load(f)
-
-        for team in teams_data.get("teams", []):
-            try:
-                # Adiciona company info ao documento
-                team["company"] = teams_data.get("company", "TechNova Store")
+        teams_data = json_loads(teams_file.read_bytes())
 
-                teams_container.upsert_item(team)
-                logger.info(f"✓ Time '{team['name']}' salvo")
+        teams = teams_data.get("teams", [])
+        for team in teams:
+            # Adiciona company info ao documento
+            team["company"] = teams_data.get("company", "TechNova Store")
 
-            except exceptions.CosmosHttpResponseError as e:
-                logger.warning(f"✗ Falha ao salvar time '{team.get('name')}': {e.message}")
-
-        # Salva regras de roteamento
+        # Regras de roteamento
         routing_rules = {
             "id": "routing-rules",
             "company": teams_data.get("company", "TechNova Store"),
             "rules": teams_data.get("routing_rules", []),
         }
 
-        try:
-            teams_container.upsert_item(routing_rules)
-            logger.info("✓ Regras de roteamento salvas")
-        except exceptions.CosmosHttpResponseError as e:
-            logger.warning(f"✗ Falha ao salvar regras: {e.message}")
+        # Cada documento fica em sua própria partição (/id), então um batch
+        # transacional não agrupa nada; disparamos times e regras juntos em
+        # paralelo para pagar ~1 round-trip em vez de N + 1.
+        documents = [(team, f"Time '{team.get('name')}'") for team in teams]
+        documents.append((routing_rules, "Regras de roteamento"))
+
+        semaphore = asyncio.Semaphore(UPSERT_CONCURRENCY)
+        await asyncio.gather(
+            *(
+                _upsert_document(teams_container, document, label, semaphore)
+                for document, label in documents
+            )
+        )
 
     else:
         logger.warning(f"Arquivo de times não encontrado: {teams_file}")
@@ -148,20 +176,18 @@ Para verificar no Azure Portal:
 """)
 
 
-def verify_connection():
-    """Verifica se a conexão com o Cosmos DB está funcionando."""
-    settings = get_settings()
+async def verify_connection(client: CosmosClient):
+    """
+    Verifica se a conexão com o Cosmos DB está funcionando.
 
+    Args:
+        client: Cliente Cosmos DB
+    """
     logger.info("Verificando conexão...")
 
     try:
-        client = CosmosClient(
-            url=settings.cosmos_endpoint,
-            credential=settings.cosmos_key,
-        )
-
         # Lista databases para verificar conexão
-        databases = list(client.list_databases())
+        databases = [db async for db in client.list_databases()]
         logger.info(f"✓ Conexão OK. Databases existentes: {len(databases)}")
 
         return True
@@ -171,53 +197,118 @@ def verify_connection():
         return False
 
 
-def show_stats():
-    """Mostra estatísticas atuais do database."""
-    settings = get_settings()
+async def _run_count(items) -> int:
+    """Consome o resultado de uma query COUNT."""
+    count = [item async for item in items]
+    return count[0] if count else 0
+
+
+async def _count_documents(container, partition_keys: Optional[List[str]] = None) -> int:
+    """
+    Conta documentos de um container.
+
+    Args:
+        container: Container do Cosmos DB
+        partition_keys: Partições conhecidas; se informadas, cada uma é
+            contada em paralelo e os parciais são somados
+
+    Returns:
+        Número de documentos
+    """
+    if not partition_keys:
+        return await _run_count(container.query_items(COUNT_QUERY))
+
+    partials = await asyncio.gather(*(
+        _run_count(container.query_items(COUNT_QUERY, partition_key=partition_key))
+        for partition_key in partition_keys
+    ))
+    return sum(partials)
 
-    try:
-        client = CosmosClient(
-            url=settings.cosmos_endpoint,
-            credential=settings.cosmos_key,
-        )
 
+async def show_stats(client: CosmosClient, settings: Settings):
+    """
+    Mostra estatísticas atuais do database.
+
+    Args:
+        client: Cliente Cosmos DB
+        settings: Configurações da aplicação
+    """
+    try:
         database = client.get_database_client(settings.cosmos_database_name)
 
         logger.info("\n" + "=" * 60)
         logger.info("ESTATÍSTICAS DO DATABASE")
         logger.info("=" * 60)
 
-        # Container complaints
-        try:
-            complaints = database.get_container_client("complaints")
-            query = "SELECT VALUE COUNT(1) FROM c"
-            count = list(complaints.query_items(query, enable_cross_partition_query=True))
-            logger.info(f"• Complaints: {count[0] if count else 0} documentos")
-        except Exception:
-            logger.info("• Complaints: container não encontrado")
-
-        # Container audit_log
-        try:
-            audit = database.get_container_client("audit_log")
-            query = "SELECT VALUE COUNT(1) FROM c"
-            count = list(audit.query_items(query, enable_cross_partition_query=True))
-            logger.info(f"• Audit Log: {count[0] if count else 0} eventos")
-        except Exception:
-            logger.info("• Audit Log: container não encontrado")
-
-        # Container teams
-        try:
-            teams = database.get_container_client("teams")
-            query = "SELECT VALUE COUNT(1) FROM c"
-            count = list(teams.query_items(query, enable_cross_partition_query=True))
-            logger.info(f"• Teams: {count[0] if count else 0} documentos")
-        except Exception:
-            logger.info("• Teams: container não encontrado")
+        # Contagens independentes rodam em paralelo. Em 'complaints' as
+        # partições (/source) são conhecidas, então cada uma é contada
+        # separadamente em vez de uma query cross-partition serial.
+        counters = [
+            ("Complaints", "complaints", "documentos", COMPLAINT_PARTITIONS),
+            ("Audit Log", "audit_log", "eventos", None),
+            ("Teams", "teams", "documentos", None),
+        ]
+
+        counts = await asyncio.gather(
+            *(
+                _count_documents(database.get_container_client(container_id), partition_keys)
+                for _, container_id, _, partition_keys in counters
+            ),
+            return_exceptions=True,
+        )
+
+        for (label, _, unit, _), count in zip(counters, counts):
+            if isinstance(count, exceptions.CosmosResourceNotFoundError):
+                logger.info(f"• {label}: container não encontrado")
+            elif isinstance(count, Exception):
+                logger.warning(f"• {label}: falha na contagem ({count})")
+            else:
+                logger.info(f"• {label}: {count} {unit}")
 
     except Exception as e:
         logger.error(f"Falha ao obter estatísticas: {e}")
 
 
+async def main(args) -> int:
+    """
+    Executa as etapas solicitadas com um único cliente (e handshake).
+
+    Returns:
+        Código de saída do processo
+    """
+    # Configurações lidas uma única vez e repassadas às etapas
+    settings = get_settings()
+    client = create_client(settings)
+    connected = False
+
+    try:
+        # Abre a conexão (handshake + metadados da conta); o async with fecha
+        # a sessão em qualquer saída, inclusive por erro nas etapas
+        async with client:
+            connected = True
+
+            if args.verify:
+                await verify_connection(client)
+            elif args.stats:
+                await show_stats(client, settings)
+            else:
+                if not await verify_connection(client):
+                    logger.error("Conexão falhou. Verifique as credenciais no .env")
+                    return 1
+                await init_database(client, settings)
+                await show_stats(client, settings)
+
+    except Exception as e:
+        if connected:
+            raise
+        logger.error(f"✗ Falha na conexão: {e}")
+        logger.error("Conexão falhou. Verifique as credenciais no .env")
+        # Falha no __aenter__: o async with não chama __aexit__
+        await client.close()
+        return 1
+
+    return 0
+
 if __name__ == "__main__":
     import argparse
 
@@ -237,14 +328,4 @@ if __name__ == "__main__":
 
     args = parser.parse_args()
 
-    if args.verify:
-        verify_connection()
-    elif args.stats:
-        show_stats()
-    else:
-        if verify_connection():
-            init_database()
-            show_stats()
-        else:
-            logger.error("Conexão falhou. Verifique as credenciais no .env")
-            sys.exit(1)
+    sys.exit(asyncio.run(main(args)))
@@ -6,8 +6,9 @@ Executa o workflow completo de classificação e roteamento.
 
 import asyncio
 import sys
+import time
+from collections import Counter
 from pathlib import Path
-from datetime import datetime
 
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -25,6 +26,13 @@ from src.models.schemas import WorkflowStatus
 def setup_logging(verbose: bool = False) -> None:
     """Configura logging."""
     level = logging.DEBUG if verbose else logging.INFO
+
+    # O formato não usa thread/processo: evita esses lookups a cada registro
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging.raiseExceptions = False
+
     logging.basicConfig(
         level=level,
         format='%(asctime)s | %(name)-20s | %(levelname)-8s | %(message)s',
@@ -43,49 +51,95 @@ def print_header() -> None:
     print("=" * 70)
 
 
+# Templates do resultado por reclamação (blocos opcionais anexados conforme o estado)
+_RESULT_TMPL = (
+    "\n{emoji} {id}\n"
+    "   Fonte: {source}\n"
+    "   Título: {title}...\n"
+    "   Status: {status}\n"
+)
+_ANALYSIS_TMPL = (
+    "   Categoria: %s\n"
+    "   Urgência: %s\n"
+    "   Sentimento: %s\n"
+)
+_ROUTING_TMPL = (
+    "   Time: %s\n"
+    "   Prioridade: %s\n"
+    "   SLA: %sh\n"
+)
+
+
 def print_result(state) -> None:
     """Imprime resultado de uma reclamação processada."""
     complaint = state.complaint_raw
     status_emoji = "✅" if state.workflow_status == WorkflowStatus.COMPLETED else "❌"
 
-    print(f"\n{status_emoji} {complaint.id or complaint.external_id}")
-    print(f"   Fonte: {complaint.source.value}")
-    print(f"   Título: {complaint.title[:50]}...")
-    print(f"   Status: {state.workflow_status.value}")
-
-    if state.complaint_analyzed:
-        print(f"   Categoria: {state.complaint_analyzed.category.value}")
-        print(f"   Urgência: {state.complaint_analyzed.urgency.value}")
-        print(f"   Sentimento: {state.complaint_analyzed.sentiment.value}")
-
-    if state.routing_decision:
-        print(f"   Time: {state.routing_decision.team}")
-        print(f"   Prioridade: {state.routing_decision.priority.value}")
-        print(f"   SLA: {state.routing_decision.sla_hours}h")
+    # Monta todas as partes e escreve de uma vez (um write por reclamação)
+    parts = [
+        _RESULT_TMPL.format_map({
+            "emoji": status_emoji,
+            "id": complaint.id or complaint.external_id,
+            "source": complaint.source.value,
+            "title": complaint.title[:50],
+            "status": state.workflow_status.value,
+        })
+    ]
+
+    analyzed = state.complaint_analyzed
+    if analyzed:
+        parts.append(_ANALYSIS_TMPL % (
+            analyzed.category.value,
+            analyzed.urgency.value,
+            analyzed.sentiment.value,
+        ))
+
+    routing = state.routing_decision
+    if routing:
+        parts.append(_ROUTING_TMPL % (
+            routing.team,
+            routing.priority.value,
+            routing.sla_hours,
+        ))
 
     if state.ticket_info:
-        print(f"   Ticket: {state.ticket_info.jira_key}")
+        parts.append("   Ticket: %s\n" % state.ticket_info.jira_key)
 
     if state.errors:
-        print(f"   Erros: {', '.join(state.errors)}")
+        parts.append("   Erros: %s\n" % ", ".join(state.errors))
+
+    sys.stdout.write("".join(parts))
+
+
+class BatchSummary:
+    """Contadores do lote, atualizados conforme cada resultado chega."""
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.completed = 0
+        self.categories: Counter = Counter()
+        self.teams: Counter = Counter()
 
+    @property
+    def failed(self) -> int:
+        """Número de reclamações que não completaram o workflow."""
+        return self.total - self.completed
 
-def print_summary(results: list, elapsed: float) -> None:
+    def add(self, state) -> None:
+        """Contabiliza o resultado de uma reclamação."""
+        self.total += 1
+        if state.workflow_status == WorkflowStatus.COMPLETED:
+            self.completed += 1
+
+        if state.complaint_analyzed:
+            self.categories[state.complaint_analyzed.category.value] += 1
+        if state.routing_decision:
+            self.teams[state.routing_decision.team] += 1
+
+
+def print_summary(summary: BatchSummary, elapsed: float) -> None:
     """Imprime resumo do processamento."""
-    total = len(results)
-    completed = sum(1 for r in results if r.workflow_status == WorkflowStatus.COMPLETED)
-    failed = total - completed
-
-    # Contagem por categoria
-    categories = {}
-    teams = {}
-    for r in results:
-        if r.complaint_analyzed:
-            cat = r.complaint_analyzed.category.value
-            categories[cat] = categories.get(cat, 0) + 1
-        if r.routing_decision:
-            team = r.routing_decision.team
-            teams[team] = teams.get(team, 0) + 1
+    total = summary.total
 
     print("\n" + "=" * 70)
     print("  RESUMO DO PROCESSAMENTO")
@@ -93,18 +147,18 @@ def print_summary(results: list, elapsed: float) -> None:
 
     print(f"\n📊 Estatísticas Gerais:")
     print(f"   Total processado: {total}")
-    print(f"   ✅ Sucesso: {completed}")
-    print(f"   ❌ Falhou: {failed}")
+    print(f"   ✅ Sucesso: {summary.completed}")
+    print(f"   ❌ Falhou: {summary.failed}")
     print(f"   ⏱️  Tempo: {elapsed:.2f}s ({elapsed/total:.2f}s/reclamação)")
 
-    if categories:
+    if summary.categories:
         print(f"\n📁 Por Categoria:")
-        for cat, count in sorted(categories.items(), key=lambda x: -x[1]):
+        for cat, count in summary.categories.most_common():
             print(f"   {cat}: {count}")
 
-    if teams:
+    if summary.teams:
         print(f"\n👥 Por Time:")
-        for team, count in sorted(teams.items(), key=lambda x: -x[1]):
+        for team, count in summary.teams.most_common():
             print(f"   {team}: {count}")
 
     print("\n" + "=" * 70 + "\n")
@@ -127,6 +181,12 @@ async def main():
         default=None,
         help="Filtrar por fonte (ex: reclame_aqui, jira, chat)"
     )
+    parser.add_argument(
+        "-c", "--concurrency",
+        type=int,
+        default=8,
+        help="Reclamações processadas em paralelo (default: 8)"
+    )
     parser.add_argument(
         "-v", "--verbose",
         action="store_true",
@@ -146,6 +206,7 @@ async def main():
     print(f"\n🔧 Configuração:")
     print(f"   Limite: {args.limit} reclamações")
     print(f"   Fonte: {args.source or 'todas'}")
+    print(f"   Concorrência: {args.concurrency}")
     print(f"   Azure Search RAG: {'sim' if args.azure_search else 'não'}")
 
     # Inicializa orquestrador
@@ -156,25 +217,26 @@ async def main():
 
     # Processa lote
     print(f"\n🚀 Iniciando processamento de {args.limit} reclamações...\n")
-    start_time = datetime.now()
+    start_time = time.perf_counter()
 
-    results = await orchestrator.process_batch(
+    # Imprime cada resultado assim que fica pronto
+    summary = BatchSummary()
+    async for result in orchestrator.stream_batch(
         limit=args.limit,
         source_filter=args.source,
-    )
-
-    elapsed = (datetime.now() - start_time).total_seconds()
-
-    # Imprime resultados individuais
-    for result in results:
+        concurrency=args.concurrency,
+    ):
         print_result(result)
+        summary.add(result)
+    sys.stdout.flush()
+
+    elapsed = time.perf_counter() - start_time
 
     # Imprime resumo
-    print_summary(results, elapsed)
+    print_summary(summary, elapsed)
 
     # Retorna código de erro se houve falhas
-    failed = sum(1 for r in results if r.workflow_status != WorkflowStatus.COMPLETED)
-    return 1 if failed > 0 else 0
+    return 1 if summary.failed > 0 else 0
 
 
 if __name__ == "__main__":
@@ -4,8 +4,11 @@ Verifica Azure OpenAI, Azure AI Search e LangSmith.
 """
 
 import asyncio
+import contextvars
 import sys
 from pathlib import Path
+from typing import Awaitable, Callable, List, Optional, Tuple
+from urllib.parse import urlparse
 
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -14,59 +17,106 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import os
+from types import SimpleNamespace
+
+# Buffer de saída do teste em execução. Os testes rodam em paralelo, então
+# cada um acumula suas linhas e o main imprime tudo na ordem original.
+_output: contextvars.ContextVar[Optional[List[str]]] = contextvars.ContextVar(
+    "probe_output", default=None
+)
+
+
+def emit(text: str = "") -> None:
+    """Escreve no buffer do teste atual (ou direto no stdout)."""
+    buffer = _output.get()
+    if buffer is None:
+        print(text)
+    else:
+        buffer.append(text)
+
+
+def load_config() -> SimpleNamespace:
+    """Lê as variáveis de ambiente uma única vez para todos os testes."""
+    return SimpleNamespace(
+        azure_openai_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+        azure_openai_api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+        azure_openai_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o-mini"),
+        azure_openai_api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview"),
+        azure_search_endpoint=os.getenv("AZURE_SEARCH_ENDPOINT"),
+        azure_search_api_key=os.getenv("AZURE_SEARCH_API_KEY"),
+        azure_search_index_name=os.getenv("AZURE_SEARCH_INDEX_NAME", "teams-index"),
+        langchain_tracing=os.getenv("LANGCHAIN_TRACING_V2", "false"),
+        langchain_api_key=os.getenv("LANGCHAIN_API_KEY"),
+        langchain_project=os.getenv("LANGCHAIN_PROJECT", "reclamaai"),
+        cosmos_endpoint=os.getenv("COSMOS_ENDPOINT"),
+        cosmos_key=os.getenv("COSMOS_KEY"),
+        cosmos_database_name=os.getenv("COSMOS_DATABASE_NAME", "reclamaai"),
+        mock_data_path=os.getenv("MOCK_DATA_PATH", "./data/mock"),
+    )
+
+
+def is_valid_url(value: Optional[str]) -> bool:
+    """Verifica se o endpoint é uma URL http(s) antes de montar o cliente."""
+    if not value:
+        return False
+    parsed = urlparse(value)
+    return parsed.scheme in ("http", "https") and bool(parsed.netloc)
 
 
 def print_header(title: str) -> None:
     """Imprime cabeçalho formatado."""
-    print("\n" + "=" * 60)
-    print(f"  {title}")
-    print("=" * 60)
+    emit("\n" + "=" * 60)
+    emit(f"  {title}")
+    emit("=" * 60)
 
 
 def print_result(name: str, success: bool, message: str = "") -> None:
     """Imprime resultado do teste."""
     status = "✅ OK" if success else "❌ FALHOU"
-    print(f"  {name}: {status}")
+    emit(f"  {name}: {status}")
     if message:
-        print(f"     └─ {message}")
+        emit(f"     └─ {message}")
 
 
-async def test_azure_openai() -> bool:
+async def test_azure_openai(cfg: SimpleNamespace) -> bool:
     """Testa conexão com Azure OpenAI."""
     print_header("AZURE OPENAI")
 
     # Verifica variáveis de ambiente
-    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    api_key = os.getenv("AZURE_OPENAI_API_KEY")
-    deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o-mini")
-    api_version = os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview")
-
-    print(f"  Endpoint: {endpoint}")
-    print(f"  Deployment: {deployment}")
-    print(f"  API Version: {api_version}")
-    print(f"  API Key: {'*' * 20}...{api_key[-4:] if api_key else 'NÃO CONFIGURADA'}")
-    print()
+    endpoint = cfg.azure_openai_endpoint
+    api_key = cfg.azure_openai_api_key
+    deployment = cfg.azure_openai_deployment
+    api_version = cfg.azure_openai_api_version
+
+    emit(f"  Endpoint: {endpoint}")
+    emit(f"  Deployment: {deployment}")
+    emit(f"  API Version: {api_version}")
+    emit(f"  API Key: {'*' * 20}...{api_key[-4:] if api_key else 'NÃO CONFIGURADA'}")
+    emit()
 
     if not endpoint or not api_key:
         print_result("Configuração", False, "Endpoint ou API Key não configurados")
         return False
 
+    if not is_valid_url(endpoint):
+        print_result("Configuração", False, "Endpoint não é uma URL http(s) válida")
+        return False
+
     print_result("Configuração", True, "Variáveis encontradas")
 
     try:
-        from openai import AzureOpenAI
+        from openai import AsyncAzureOpenAI
 
-        client = AzureOpenAI(
+        async with AsyncAzureOpenAI(
             azure_endpoint=endpoint,
             api_key=api_key,
             api_version=api_version,
-        )
-
-        response = client.chat.completions.create(
-            model=deployment,
-            messages=[{"role": "user", "content": "Responda apenas: OK"}],
-            max_tokens=10,
-        )
+        ) as client:
+            response = await client.chat.completions.create(
+                model=deployment,
+                messages=[{"role": "user", "content": "Responda apenas: OK"}],
+                max_tokens=10,
+            )
 
         result = response.choices[0].message.content
         print_result("Conexão LLM", True, f"Resposta: {result}")
@@ -77,23 +127,27 @@ async def test_azure_openai() -> bool:
         return False
 
 
-async def test_azure_search() -> bool:
+async def test_azure_search(cfg: SimpleNamespace) -> bool:
     """Testa conexão com Azure AI Search."""
     print_header("AZURE AI SEARCH")
 
-    endpoint = os.getenv("AZURE_SEARCH_ENDPOINT")
-    api_key = os.getenv("AZURE_SEARCH_API_KEY")
-    index_name = os.getenv("AZURE_SEARCH_INDEX_NAME", "teams-index")
+    endpoint = cfg.azure_search_endpoint
+    api_key = cfg.azure_search_api_key
+    index_name = cfg.azure_search_index_name
 
-    print(f"  Endpoint: {endpoint}")
-    print(f"  Index: {index_name}")
-    print(f"  API Key: {'*' * 20}...{api_key[-4:] if api_key else 'NÃO CONFIGURADA'}")
-    print()
+    emit(f"  Endpoint: {endpoint}")
+    emit(f"  Index: {index_name}")
+    emit(f"  API Key: {'*' * 20}...{api_key[-4:] if api_key else 'NÃO CONFIGURADA'}")
+    emit()
 
     if not endpoint or not api_key:
         print_result("Configuração", False, "Endpoint ou API Key não configurados")
         return False
 
+    if not is_valid_url(endpoint):
+        print_result("Configuração", False, "Endpoint não é uma URL http(s) válida")
+        return False
+
     print_result("Configuração", True, "Variáveis encontradas")
 
     try:
@@ -104,12 +158,12 @@ async def test_azure_search() -> bool:
         index_client = SearchIndexClient(endpoint=endpoint, credential=credential)
 
         # Lista índices existentes
-        indexes = []
-        for idx in index_client.list_indexes():
-            indexes.append(idx.name)
+        indexes = await asyncio.to_thread(
+            lambda: [idx.name for idx in index_client.list_indexes()]
+        )
 
         print_result("Conexão", True, "Conectado ao serviço")
-        print(f"     └─ Índices existentes: {indexes if indexes else 'Nenhum'}")
+        emit(f"     └─ Índices existentes: {indexes if indexes else 'Nenhum'}")
 
         if index_name in indexes:
             print_result(f"Índice '{index_name}'", True, "Encontrado")
@@ -123,18 +177,18 @@ async def test_azure_search() -> bool:
         return False
 
 
-async def test_langsmith() -> bool:
+async def test_langsmith(cfg: SimpleNamespace) -> bool:
     """Testa conexão com LangSmith."""
     print_header("LANGSMITH (Observabilidade)")
 
-    tracing = os.getenv("LANGCHAIN_TRACING_V2", "false")
-    api_key = os.getenv("LANGCHAIN_API_KEY")
-    project = os.getenv("LANGCHAIN_PROJECT", "reclamaai")
+    tracing = cfg.langchain_tracing
+    api_key = cfg.langchain_api_key
+    project = cfg.langchain_project
 
-    print(f"  Tracing Ativo: {tracing}")
-    print(f"  Projeto: {project}")
-    print(f"  API Key: {'*' * 20}...{api_key[-4:] if api_key else 'NÃO CONFIGURADA'}")
-    print()
+    emit(f"  Tracing Ativo: {tracing}")
+    emit(f"  Projeto: {project}")
+    emit(f"  API Key: {'*' * 20}...{api_key[-4:] if api_key else 'NÃO CONFIGURADA'}")
+    emit()
 
     if not api_key:
         print_result("Configuração", False, "API Key não configurada")
@@ -146,11 +200,11 @@ async def test_langsmith() -> bool:
         from langsmith import Client
 
         client = Client()
-        projects = list(client.list_projects())
+        projects = await asyncio.to_thread(lambda: list(client.list_projects()))
         project_names = [p.name for p in projects]
 
         print_result("Conexão", True, "Conectado ao LangSmith")
-        print(f"     └─ Projetos: {project_names[:5]}{'...' if len(project_names) > 5 else ''}")
+        emit(f"     └─ Projetos: {project_names[:5]}{'...' if len(project_names) > 5 else ''}")
 
         if project in project_names:
             print_result(f"Projeto '{project}'", True, "Encontrado")
@@ -164,22 +218,26 @@ async def test_langsmith() -> bool:
         return False
 
 
-async def test_cosmos_db() -> bool:
+async def test_cosmos_db(cfg: SimpleNamespace) -> bool:
     """Testa conexão com Cosmos DB."""
     print_header("AZURE COSMOS DB")
 
-    endpoint = os.getenv("COSMOS_ENDPOINT")
-    key = os.getenv("COSMOS_KEY")
-    database = os.getenv("COSMOS_DATABASE_NAME", "reclamaai")
+    endpoint = cfg.cosmos_endpoint
+    key = cfg.cosmos_key
+    database = cfg.cosmos_database_name
 
-    print(f"  Endpoint: {endpoint}")
-    print(f"  Database: {database}")
-    print(f"  Key: {'*' * 20}...{key[-4:] if key else 'NÃO CONFIGURADA'}")
-    print()
+    emit(f"  Endpoint: {endpoint}")
+    emit(f"  Database: {database}")
+    emit(f"  Key: {'*' * 20}...{key[-4:] if key else 'NÃO CONFIGURADA'}")
+    emit()
 
     if not endpoint or not key:
         print_result("Configuração", False, "Endpoint ou Key não configurados")
-        print("     └─ Cosmos DB é opcional para o MVP (dados ficam em memória)")
+        emit("     └─ Cosmos DB é opcional para o MVP (dados ficam em memória)")
+        return False
+
+    if not is_valid_url(endpoint):
+        print_result("Configuração", False, "Endpoint não é uma URL http(s) válida")
         return False
 
     print_result("Configuração", True, "Variáveis encontradas")
@@ -187,12 +245,12 @@ async def test_cosmos_db() -> bool:
     try:
         from azure.cosmos import CosmosClient
 
-        client = CosmosClient(endpoint, key)
-        databases = list(client.list_databases())
+        client = await asyncio.to_thread(CosmosClient, endpoint, key)
+        databases = await asyncio.to_thread(lambda: list(client.list_databases()))
         db_names = [db['id'] for db in databases]
 
         print_result("Conexão", True, "Conectado ao Cosmos DB")
-        print(f"     └─ Databases: {db_names if db_names else 'Nenhum'}")
+        emit(f"     └─ Databases: {db_names if db_names else 'Nenhum'}")
 
         if database in db_names:
             print_result(f"Database '{database}'", True, "Encontrado")
@@ -206,31 +264,31 @@ async def test_cosmos_db() -> bool:
         return False
 
 
-async def test_mock_data() -> bool:
+async def test_mock_data(cfg: SimpleNamespace) -> bool:
     """Testa carregamento dos dados mock."""
     print_header("DADOS MOCK")
 
-    mock_path = os.getenv("MOCK_DATA_PATH", "./data/mock")
-    print(f"  Caminho: {mock_path}")
-    print()
+    mock_path = cfg.mock_data_path
+    emit(f"  Caminho: {mock_path}")
+    emit()
 
     try:
         from src.services.mock_data_loader import get_data_loader
 
         loader = get_data_loader()
-        stats = loader.get_stats()
+        stats = await asyncio.to_thread(loader.get_stats)
 
         print_result("Carregamento", True, "Dados carregados com sucesso")
-        print(f"     └─ Reclame Aqui: {stats['reclame_aqui']} reclamações")
-        print(f"     └─ Jira: {stats['jira']} issues")
-        print(f"     └─ Chat: {stats['chat']} transcrições")
-        print(f"     └─ Telefone: {stats['phone']} transcrições")
-        print(f"     └─ Email: {stats['email']} emails")
-        print(f"     └─ TOTAL: {stats['total']} reclamações")
+        emit(f"     └─ Reclame Aqui: {stats['reclame_aqui']} reclamações")
+        emit(f"     └─ Jira: {stats['jira']} issues")
+        emit(f"     └─ Chat: {stats['chat']} transcrições")
+        emit(f"     └─ Telefone: {stats['phone']} transcrições")
+        emit(f"     └─ Email: {stats['email']} emails")
+        emit(f"     └─ TOTAL: {stats['total']} reclamações")
 
         # Testa carregamento de times
         teams = loader.load_teams()
-        print(f"     └─ Times para RAG: {len(teams)}")
+        emit(f"     └─ Times para RAG: {len(teams)}")
 
         return True
 
@@ -239,20 +297,50 @@ async def test_mock_data() -> bool:
         return False
 
 
+async def _run_probe(
+    probe: Callable[[SimpleNamespace], Awaitable[bool]],
+    cfg: SimpleNamespace,
+) -> Tuple[bool, List[str]]:
+    """Executa um teste capturando sua saída em um buffer próprio."""
+    lines: List[str] = []
+    _output.set(lines)
+    success = await probe(cfg)
+    return success, lines
+
+
 async def main():
     """Executa todos os testes."""
     print("\n" + "🔍 " + "=" * 56)
     print("   TESTE DE CONEXÕES - ReclamaAI")
     print("=" * 60)
 
-    results = {}
+    cfg = load_config()
 
-    # Testa cada serviço
-    results["Azure OpenAI"] = await test_azure_openai()
-    results["Azure AI Search"] = await test_azure_search()
-    results["LangSmith"] = await test_langsmith()
-    results["Cosmos DB"] = await test_cosmos_db()
-    results["Dados Mock"] = await test_mock_data()
+    probes = {
+        "Azure OpenAI": test_azure_openai,
+        "Azure AI Search": test_azure_search,
+        "LangSmith": test_langsmith,
+        "Cosmos DB": test_cosmos_db,
+        "Dados Mock": test_mock_data,
+    }
+
+    # Testa todos os serviços em paralelo (são independentes)
+    outcomes = await asyncio.gather(
+        *(_run_probe(probe, cfg) for probe in probes.values()),
+        return_exceptions=True,
+    )
+
+    results = {}
+    for name, outcome in zip(probes, outcomes):
+        if isinstance(outcome, BaseException):
+            print_header(name.upper())
+            print_result("Execução", False, str(outcome))
+            results[name] = False
+            continue
+
+        success, lines = outcome
+        print("\n".join(lines))
+        results[name] = success
 
     # Resumo
     print_header("RESUMO")
@@ -7,11 +7,14 @@ Processa 10 reclamações variadas e verifica todo o fluxo.
 import asyncio
 import json
 import logging
+import re
 import sys
 import time
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Set, Tuple
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -19,7 +22,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.services.orchestrator import ComplaintOrchestrator
 from src.services.cosmos_service import get_cosmos_service
 from src.services.mock_data_loader import get_data_loader
-from src.models.schemas import ComplaintState, ComplaintSource
+from src.models.schemas import ComplaintCategory, ComplaintRaw, ComplaintState, ComplaintSource
 from src.utils.langsmith_config import get_langsmith_config, verify_langsmith_connection
 
 # Configura logging
@@ -34,131 +37,163 @@ logging.getLogger("azure").setLevel(logging.WARNING)
 logging.getLogger("httpx").setLevel(logging.WARNING)
 logging.getLogger("httpcore").setLevel(logging.WARNING)
 
+# Quantidade de reclamações exercitadas pelo teste
+E2E_SAMPLE_SIZE = 10
 
-class E2ETestResult:
-    """Resultado de um teste individual."""
+# Reclamações processadas ao mesmo tempo (chamadas ao LLM e Cosmos são I/O)
+E2E_CONCURRENCY = 5
 
-    def __init__(self, complaint_id: str):
-        self.complaint_id = complaint_id
-        self.source = ""
-        self.original_description = ""
-        self.anonymized_description = ""
-        self.pii_anonymized = False
-        self.category = ""
-        self.expected_team = ""
-        self.actual_team = ""
-        self.routing_correct = False
-        self.ticket_created = False
-        self.ticket_id = ""
-        self.saved_to_cosmos = False
-        self.processing_time = 0.0
-        self.status = ""
-        self.errors: List[str] = []
+# Leituras simultâneas no fallback de verificação do Cosmos DB
+VERIFY_CONCURRENCY = 10
 
 
-async def run_e2e_test():
-    """Executa teste end-to-end completo."""
+# Time esperado para cada categoria (usado para validar o roteamento)
+CATEGORY_TEAM_MAP: Dict[ComplaintCategory, str] = {
+    ComplaintCategory.ATRASO_ENTREGA: "Time de Logística",
+    ComplaintCategory.PRODUTO_NAO_ENTREGUE: "Time de Logística",
+    ComplaintCategory.PRODUTO_DEFEITO: "Time de Produtos",
+    ComplaintCategory.PRODUTO_DIFERENTE: "Time de Produtos",
+    ComplaintCategory.COBRANCA_INDEVIDA: "Time Financeiro",
+    ComplaintCategory.REEMBOLSO_NAO_PROCESSADO: "Time Financeiro",
+    ComplaintCategory.ATENDIMENTO_RUIM: "Atendimento Nível 2",
+    ComplaintCategory.CANCELAMENTO_NEGADO: "Atendimento Nível 2",
+    ComplaintCategory.DIFICULDADE_CONTATO: "Atendimento Nível 2",
+    ComplaintCategory.PROBLEMA_VENDEDOR: "Time Marketplace",
+}
 
-    print("=" * 70)
-    print("  TESTE END-TO-END DO RECLAMAAI")
-    print("=" * 70)
-    print(f"  Data/Hora: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 70)
 
-    # 1. Verifica pré-requisitos
-    print("\n[1/6] VERIFICANDO PRÉ-REQUISITOS...")
-    print("-" * 50)
+# Indícios de PII no texto original (uma única busca, sem copiar o texto em minúsculas)
+_PII_HINT_RE = re.compile(r"cpf|email|@|telefone|cart[aã]o", re.IGNORECASE)
 
-    # LangSmith
-    langsmith = get_langsmith_config()
-    if langsmith.is_enabled():
-        status = await verify_langsmith_connection()
-        if status.get("connected"):
-            print(f"  ✓ LangSmith: Conectado (projeto: {langsmith.settings.langchain_project})")
-        else:
-            print(f"  ⚠ LangSmith: Configurado mas não conectado")
-    else:
-        print("  ⚠ LangSmith: Não configurado (traces não serão enviados)")
+# Marcadores que o agente de privacidade deixa no lugar dos dados removidos
+PII_MARKERS = ("[CPF REMOVIDO]", "[EMAIL REMOVIDO]", "[TELEFONE REMOVIDO]", "[CARTÃO REMOVIDO]")
 
-    # Cosmos DB
-    cosmos = get_cosmos_service()
-    try:
-        await cosmos.initialize()
-        print("  ✓ Cosmos DB: Conectado")
-    except Exception as e:
-        print(f"  ✗ Cosmos DB: Erro - {e}")
-        return
 
-    # 2. Carrega reclamações variadas
-    print("\n[2/6] CARREGANDO RECLAMAÇÕES VARIADAS...")
-    print("-" * 50)
+def _trunc(text: str, width: int, suffix: str = "...") -> str:
+    """Corta o texto para caber em `width` caracteres (incluindo o sufixo)."""
+    if len(text) <= width:
+        return text
+    return f"{text[:width - len(suffix)]}{suffix}"
 
-    loader = get_data_loader()
-    all_complaints = loader.load_all_complaints()
 
-    # Seleciona 10 reclamações de diferentes fontes
-    selected = []
-    sources_used = set()
-
-    # Tenta pegar 2 de cada fonte
-    for complaint in all_complaints:
-        source = complaint.source.value
-        if source not in sources_used or len([c for c in selected if c.source.value == source]) < 2:
-            selected.append(complaint)
-            sources_used.add(source)
-        if len(selected) >= 10:
+@dataclass(slots=True)
+class E2ETestResult:
+    """Resultado de um teste individual."""
+
+    complaint_id: str
+    source: str = ""
+    original_description: str = ""
+    anonymized_description: str = ""
+    pii_anonymized: bool = False
+    category: str = ""
+    expected_team: str = ""
+    actual_team: str = ""
+    routing_correct: bool = False
+    ticket_created: bool = False
+    ticket_id: str = ""
+    saved_to_cosmos: bool = False
+    processing_time: float = 0.0
+    status: str = ""
+    errors: List[str] = field(default_factory=list)
+
+
+def _select_complaints(
+    complaints: List[ComplaintRaw],
+    total: int,
+    per_source_cap: int = 2,
+) -> Tuple[List[ComplaintRaw], Counter]:
+    """
+    Seleciona reclamações variadas, limitando quantas vêm de cada fonte.
+
+    Args:
+        complaints: Reclamações disponíveis
+        total: Quantidade a selecionar
+        per_source_cap: Máximo por fonte na primeira passada
+
+    Returns:
+        Tupla (reclamações selecionadas, contagem por fonte)
+    """
+    selected: List[ComplaintRaw] = []
+    selected_ids = set()
+    per_source = Counter()
+
+    def take(complaint: ComplaintRaw) -> None:
+        selected.append(complaint)
+        selected_ids.add(id(complaint))
+        per_source[complaint.source.value] += 1
+
+    # Tenta pegar `per_source_cap` de cada fonte
+    for complaint in complaints:
+        if len(selected) >= total:
             break
+        if per_source[complaint.source.value] < per_source_cap:
+            take(complaint)
 
     # Completa com mais se necessário
-    for complaint in all_complaints:
-        if complaint not in selected:
-            selected.append(complaint)
-        if len(selected) >= 10:
+    for complaint in complaints:
+        if len(selected) >= total:
             break
-
-    print(f"  Selecionadas: {len(selected)} reclamações")
-    for source in set(c.source.value for c in selected):
-        count = len([c for c in selected if c.source.value == source])
-        print(f"    - {source}: {count}")
-
-    # 3. Processa reclamações
-    print("\n[3/6] PROCESSANDO RECLAMAÇÕES...")
-    print("-" * 50)
-
-    orchestrator = ComplaintOrchestrator(enable_persistence=True)
-    results: List[E2ETestResult] = []
-
-    for i, complaint in enumerate(selected):
+        if id(complaint) not in selected_ids:
+            take(complaint)
+
+    return selected, per_source
+
+
+def _print_distribution(label: str, counts: Counter) -> None:
+    """Imprime uma distribuição (mais frequentes primeiro) com um único print."""
+    lines = [f"\n  DISTRIBUIÇÃO POR {label}:"]
+    lines.extend(f"    {key}: {count}" for key, count in counts.most_common())
+    print("\n".join(lines))
+
+
+async def _run_one(
+    orchestrator: ComplaintOrchestrator,
+    semaphore: asyncio.Semaphore,
+    i: int,
+    total: int,
+    complaint: ComplaintRaw,
+) -> Tuple[E2ETestResult, List[str]]:
+    """
+    Processa uma reclamação do teste, acumulando a saída em um buffer próprio.
+
+    Args:
+        orchestrator: Orquestrador compartilhado
+        semaphore: Limita quantas reclamações rodam ao mesmo tempo
+        i: Posição da reclamação na seleção
+        total: Total de reclamações selecionadas
+        complaint: Reclamação a processar
+
+    Returns:
+        Tupla (resultado do teste, linhas a imprimir)
+    """
+    lines: List[str] = []
+
+    async with semaphore:
         complaint_id = complaint.id or complaint.external_id
         result = E2ETestResult(complaint_id)
         result.source = complaint.source.value
-        result.original_description = complaint.description[:100] + "..." if len(complaint.description) > 100 else complaint.description
+        result.original_description = _trunc(complaint.description, 100)
 
-        print(f"\n  [{i+1}/10] {complaint_id}")
-        print(f"         Fonte: {complaint.source.value}")
-        print(f"         Título: {complaint.title[:50]}...")
+        lines.append(f"\n  [{i+1}/{total}] {complaint_id}")
+        lines.append(f"         Fonte: {complaint.source.value}")
+        lines.append(f"         Título: {complaint.title[:50]}...")
 
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         try:
             state = await orchestrator.process_complaint(complaint)
-            result.processing_time = time.time() - start_time
+            result.processing_time = time.perf_counter() - start_time
             result.status = state.workflow_status.value
 
             # Verifica anonimização
             if state.complaint_anonymized:
-                result.anonymized_description = state.complaint_anonymized.description[:100] + "..."
+                result.anonymized_description = _trunc(state.complaint_anonymized.description, 100)
 
                 # Verifica se PII foi removido
-                pii_markers = ["[CPF REMOVIDO]", "[EMAIL REMOVIDO]", "[TELEFONE REMOVIDO]", "[CARTÃO REMOVIDO]"]
-                original_has_pii = any(
-                    marker.replace("[", "").replace("]", "").replace(" REMOVIDO", "").lower()
-                    in complaint.description.lower()
-                    for marker in ["cpf", "email", "@", "telefone", "cartão", "cartao"]
-                )
+                original_has_pii = _PII_HINT_RE.search(complaint.description) is not None
 
                 if original_has_pii:
-                    result.pii_anonymized = any(marker in state.complaint_anonymized.description for marker in pii_markers)
+                    result.pii_anonymized = any(marker in state.complaint_anonymized.description for marker in PII_MARKERS)
                 else:
                     result.pii_anonymized = True  # Não tinha PII, então está OK
 
@@ -171,20 +206,10 @@ async def run_e2e_test():
                 result.actual_team = state.routing_decision.team
 
                 # Verifica se roteamento faz sentido
-                category_team_map = {
-                    "Atraso na entrega": "Time de Logística",
-                    "Produto não entregue": "Time de Logística",
-                    "Produto com defeito": "Time de Produtos",
-                    "Produto diferente do anunciado": "Time de Produtos",
-                    "Cobrança indevida": "Time Financeiro",
-                    "Reembolso não processado": "Time Financeiro",
-                    "Atendimento ruim": "Atendimento Nível 2",
-                    "Cancelamento negado": "Atendimento Nível 2",
-                    "Dificuldade de contato": "Atendimento Nível 2",
-                    "Problema com vendedor (marketplace)": "Time Marketplace",
-                }
-
-                result.expected_team = category_team_map.get(result.category, "")
+                if state.complaint_analyzed:
+                    result.expected_team = CATEGORY_TEAM_MAP.get(
+                        state.complaint_analyzed.category, ""
+                    )
                 result.routing_correct = result.actual_team == result.expected_team
 
             # Verifica ticket
@@ -194,21 +219,130 @@ async def run_e2e_test():
 
             # Status
             status_icon = "✓" if state.workflow_status.value == "COMPLETED" else "⚠"
-            print(f"         Status: {status_icon} {state.workflow_status.value}")
-            print(f"         Categoria: {result.category}")
-            print(f"         Time: {result.actual_team}")
-            print(f"         Tempo: {result.processing_time:.2f}s")
+            lines.append(f"         Status: {status_icon} {state.workflow_status.value}")
+            lines.append(f"         Categoria: {result.category}")
+            lines.append(f"         Time: {result.actual_team}")
+            lines.append(f"         Tempo: {result.processing_time:.2f}s")
 
             if state.errors:
                 result.errors = state.errors
-                print(f"         Erros: {state.errors}")
+                lines.append(f"         Erros: {state.errors}")
 
         except Exception as e:
-            result.processing_time = time.time() - start_time
+            result.processing_time = time.perf_counter() - start_time
             result.status = "ERROR"
             result.errors.append(str(e))
-            print(f"         ✗ ERRO: {e}")
+            lines.append(f"         ✗ ERRO: {e}")
 
+        return result, lines
+
+
+async def _find_saved_individually(cosmos, results: List[E2ETestResult]) -> Set[str]:
+    """
+    Fallback da verificação em lote: uma leitura por reclamação, em paralelo.
+
+    Args:
+        cosmos: Serviço Cosmos DB inicializado
+        results: Resultados do processamento
+
+    Returns:
+        Conjunto com os IDs encontrados
+    """
+    semaphore = asyncio.Semaphore(VERIFY_CONCURRENCY)
+
+    async def fetch(result: E2ETestResult):
+        async with semaphore:
+            # A fonte é a partition key: leitura pontual em vez de query
+            return await cosmos.get_complaint(result.complaint_id, result.source)
+
+    fetched = await asyncio.gather(
+        *(fetch(r) for r in results),
+        return_exceptions=True,
+    )
+
+    return {
+        r.complaint_id
+        for r, saved in zip(results, fetched)
+        if saved is not None and not isinstance(saved, Exception)
+    }
+
+
+async def run_e2e_test():
+    """Executa teste end-to-end completo."""
+
+    print("=" * 70)
+    print("  TESTE END-TO-END DO RECLAMAAI")
+    print("=" * 70)
+    print(f"  Data/Hora: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("=" * 70)
+
+    # 1. Verifica pré-requisitos
+    print("\n[1/6] VERIFICANDO PRÉ-REQUISITOS...")
+    print("-" * 50)
+
+    # LangSmith
+    langsmith = get_langsmith_config()
+    if langsmith.is_enabled():
+        status = await verify_langsmith_connection()
+        if status.get("connected"):
+            print(f"  ✓ LangSmith: Conectado (projeto: {langsmith.settings.langchain_project})")
+        else:
+            print(f"  ⚠ LangSmith: Configurado mas não conectado")
+    else:
+        print("  ⚠ LangSmith: Não configurado (traces não serão enviados)")
+
+    # Cosmos DB
+    cosmos = get_cosmos_service()
+    try:
+        await cosmos.initialize()
+        print("  ✓ Cosmos DB: Conectado")
+    except Exception as e:
+        print(f"  ✗ Cosmos DB: Erro - {e}")
+        return
+
+    # 2. Carrega reclamações variadas
+    print("\n[2/6] CARREGANDO RECLAMAÇÕES VARIADAS...")
+    print("-" * 50)
+
+    loader = get_data_loader()
+    all_complaints = loader.load_all_complaints()
+
+    # Seleciona 10 reclamações de diferentes fontes
+    selected, per_source = _select_complaints(all_complaints, E2E_SAMPLE_SIZE)
+
+    print(f"  Selecionadas: {len(selected)} reclamações")
+    for source, count in per_source.items():
+        print(f"    - {source}: {count}")
+
+    # 3. Processa reclamações
+    print("\n[3/6] PROCESSANDO RECLAMAÇÕES...")
+    print("-" * 50)
+
+    orchestrator = ComplaintOrchestrator(enable_persistence=True)
+    semaphore = asyncio.Semaphore(E2E_CONCURRENCY)
+
+    # Reclamações processadas em paralelo; a saída de cada uma é impressa
+    # em bloco, na ordem da seleção, depois que todas terminam
+    outcomes = await asyncio.gather(
+        *(
+            _run_one(orchestrator, semaphore, i, len(selected), complaint)
+            for i, complaint in enumerate(selected)
+        ),
+        return_exceptions=True,
+    )
+
+    results: List[E2ETestResult] = []
+    for complaint, outcome in zip(selected, outcomes):
+        if isinstance(outcome, BaseException):
+            result = E2ETestResult(complaint.id or complaint.external_id)
+            result.source = complaint.source.value
+            result.status = "ERROR"
+            result.errors.append(str(outcome))
+            print(f"\n  {result.complaint_id}")
+            print(f"         ✗ ERRO: {outcome}")
+        else:
+            result, lines = outcome
+            print("\n".join(lines))
         results.append(result)
 
     # 4. Verifica dados no Cosmos DB
@@ -218,23 +352,50 @@ async def run_e2e_test():
     cosmos_stats = await cosmos.get_stats()
     print(f"  Total de documentos: {cosmos_stats.get('total', 0)}")
 
+    # Uma única query para todos os IDs em vez de uma leitura por reclamação
+    try:
+        found = await cosmos.bulk_exists([r.complaint_id for r in results])
+    except Exception as e:
+        print(f"  ⚠ Query em lote falhou ({e}); verificando individualmente")
+        found = await _find_saved_individually(cosmos, results)
+
     for result in results:
-        try:
-            saved = await cosmos.get_complaint(result.complaint_id)
-            result.saved_to_cosmos = saved is not None
-            status = "✓" if result.saved_to_cosmos else "✗"
-            print(f"  {status} {result.complaint_id[:20]}...")
-        except Exception as e:
-            result.saved_to_cosmos = False
-            print(f"  ✗ {result.complaint_id[:20]}... (erro: {e})")
+        result.saved_to_cosmos = result.complaint_id in found
+        status = "✓" if result.saved_to_cosmos else "✗"
+        print(f"  {status} {result.complaint_id[:20]}...")
 
     # 5. Gera resumo
     print("\n[5/6] RESUMO DOS RESULTADOS...")
     print("-" * 50)
 
+    # Agrega tudo em uma única passada pelos resultados
+    ok = Counter()
+    categories = Counter()
+    teams = Counter()
+    sources = Counter()
+    processing_times = []
+
+    for r in results:
+        ok["completed"] += r.status == "COMPLETED"
+        ok["pii"] += r.pii_anonymized
+        ok["routing"] += r.routing_correct
+        ok["ticket"] += r.ticket_created
+        ok["cosmos"] += r.saved_to_cosmos
+        if r.category:
+            categories[r.category] += 1
+        if r.actual_team:
+            teams[r.actual_team] += 1
+        sources[r.source] += 1
+        if r.processing_time > 0:
+            processing_times.append(r.processing_time)
+
     total = len(results)
-    successful = len([r for r in results if r.status == "COMPLETED"])
+    successful = ok["completed"]
     failed = total - successful
+    pii_ok = ok["pii"]
+    routing_ok = ok["routing"]
+    tickets_ok = ok["ticket"]
+    cosmos_ok = ok["cosmos"]
 
     print(f"\n  PROCESSAMENTO:")
     print(f"    Total processadas: {total}")
@@ -242,49 +403,25 @@ async def run_e2e_test():
     print(f"    Falhas: {failed} ({failed/total*100:.0f}%)")
 
     print(f"\n  VERIFICAÇÕES:")
-    pii_ok = len([r for r in results if r.pii_anonymized])
-    routing_ok = len([r for r in results if r.routing_correct])
-    tickets_ok = len([r for r in results if r.ticket_created])
-    cosmos_ok = len([r for r in results if r.saved_to_cosmos])
-
     print(f"    PII anonimizado: {pii_ok}/{total} ({pii_ok/total*100:.0f}%)")
     print(f"    Roteamento correto: {routing_ok}/{total} ({routing_ok/total*100:.0f}%)")
     print(f"    Tickets criados: {tickets_ok}/{total} ({tickets_ok/total*100:.0f}%)")
     print(f"    Salvos no Cosmos: {cosmos_ok}/{total} ({cosmos_ok/total*100:.0f}%)")
 
-    print(f"\n  DISTRIBUIÇÃO POR CATEGORIA:")
-    categories = {}
-    for r in results:
-        if r.category:
-            categories[r.category] = categories.get(r.category, 0) + 1
-    for cat, count in sorted(categories.items(), key=lambda x: -x[1]):
-        print(f"    {cat}: {count}")
-
-    print(f"\n  DISTRIBUIÇÃO POR TIME:")
-    teams = {}
-    for r in results:
-        if r.actual_team:
-            teams[r.actual_team] = teams.get(r.actual_team, 0) + 1
-    for team, count in sorted(teams.items(), key=lambda x: -x[1]):
-        print(f"    {team}: {count}")
-
-    print(f"\n  DISTRIBUIÇÃO POR FONTE:")
-    sources = {}
-    for r in results:
-        sources[r.source] = sources.get(r.source, 0) + 1
-    for source, count in sorted(sources.items(), key=lambda x: -x[1]):
-        print(f"    {source}: {count}")
+    _print_distribution("CATEGORIA", categories)
+    _print_distribution("TIME", teams)
+    _print_distribution("FONTE", sources)
 
-    processing_times = [r.processing_time for r in results if r.processing_time > 0]
     if processing_times:
-        avg_time = sum(processing_times) / len(processing_times)
+        total_time = sum(processing_times)
+        avg_time = total_time / len(processing_times)
         min_time = min(processing_times)
         max_time = max(processing_times)
         print(f"\n  TEMPO DE PROCESSAMENTO:")
         print(f"    Médio: {avg_time:.2f}s")
         print(f"    Mínimo: {min_time:.2f}s")
         print(f"    Máximo: {max_time:.2f}s")
-        print(f"    Total: {sum(processing_times):.2f}s")
+        print(f"    Total: {total_time:.2f}s")
 
     # 6. Instruções finais
     print("\n[6/6] VERIFICAÇÕES MANUAIS...")
@@ -312,15 +449,18 @@ async def run_e2e_test():
 """)
 
     # Tabela detalhada
-    print("\n  DETALHES POR RECLAMAÇÃO:")
-    print("  " + "-" * 90)
-    print(f"  {'ID':<25} {'Fonte':<15} {'Categoria':<25} {'Time':<20} {'OK'}")
-    print("  " + "-" * 90)
+    separator = "  " + "-" * 90
+    table = [
+        "\n  DETALHES POR RECLAMAÇÃO:",
+        separator,
+        f"  {'ID':<25} {'Fonte':<15} {'Categoria':<25} {'Time':<20} {'OK'}",
+        separator,
+    ]
 
     for r in results:
-        id_short = r.complaint_id[:23] + ".." if len(r.complaint_id) > 25 else r.complaint_id
-        cat_short = r.category[:23] + ".." if len(r.category) > 25 else r.category
-        team_short = r.actual_team[:18] + ".." if len(r.actual_team) > 20 else r.actual_team
+        id_short = _trunc(r.complaint_id, 25, "..")
+        cat_short = _trunc(r.category, 25, "..")
+        team_short = _trunc(r.actual_team, 20, "..")
 
         checks = []
         if r.pii_anonymized: checks.append("PII")
@@ -330,9 +470,10 @@ async def run_e2e_test():
 
         ok_str = ", ".join(checks) if checks else "FAILED"
 
-        print(f"  {id_short:<25} {r.source:<15} {cat_short:<25} {team_short:<20} {ok_str}")
+        table.append(f"  {id_short:<25} {r.source:<15} {cat_short:<25} {team_short:<20} {ok_str}")
 
-    print("  " + "-" * 90)
+    table.append(separator)
+    print("\n".join(table))
 
     # Resultado final
     print("\n" + "=" * 70)
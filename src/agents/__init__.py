@@ -3,7 +3,13 @@ Agentes do ReclamaAI.
 Exporta os agentes e suas factory functions.
 """
 
-from src.agents.base import AgentError, BaseAgent, StatefulAgent
+from src.agents.base import (
+    AgentError,
+    BaseAgent,
+    EmailError,
+    JiraError,
+    StatefulAgent,
+)
 from src.agents.collector import CollectorAgent, get_collector_agent
 from src.agents.privacy import PrivacyAgent, get_privacy_agent
 from src.agents.analyst import AnalystAgent, get_analyst_agent
@@ -12,6 +18,8 @@ from src.agents.communicator import CommunicatorAgent, get_communicator_agent
 
 __all__ = [
     "AgentError",
+    "JiraError",
+    "EmailError",
     "BaseAgent",
     "StatefulAgent",
     "CollectorAgent",
@@ -4,8 +4,8 @@ Define a interface comum e comportamentos compartilhados.
 """
 
 import logging
+import time
 from abc import ABC, abstractmethod
-from datetime import datetime
 from typing import Any, Dict, Generic, Optional, TypeVar
 
 from src.models.schemas import ComplaintState, WorkflowStatus
@@ -27,6 +27,14 @@ class AgentError(Exception):
         super().__init__(f"[{agent_name}] {message}")
 
 
+class JiraError(AgentError):
+    """Falha ao criar ticket no Jira."""
+
+
+class EmailError(AgentError):
+    """Falha ao enviar notificação por email."""
+
+
 class BaseAgent(ABC, Generic[InputT, OutputT]):
     """
     Classe base abstrata para todos os agentes.
@@ -70,11 +78,25 @@ class BaseAgent(ABC, Generic[InputT, OutputT]):
         """
         pass
 
+    async def ensure_initialized(self) -> None:
+        """
+        Inicializa o agente uma única vez.
+
+        Marca o agente como inicializado, para que execute() não repita a
+        inicialização na primeira chamada.
+        """
+        if not self._initialized:
+            await self.initialize()
+            self._initialized = True
+
     @abstractmethod
-    async def validate_input(self, input_data: InputT) -> bool:
+    def validate_input(self, input_data: InputT) -> bool:
         """
         Valida se a entrada é válida para processamento.
 
+        Síncrono: as validações são checagens em memória e não precisam
+        de uma corrotina por chamada.
+
         Args:
             input_data: Dados de entrada a validar
 
@@ -96,17 +118,18 @@ class BaseAgent(ABC, Generic[InputT, OutputT]):
         Raises:
             AgentError: Se ocorrer erro no processamento
         """
-        start_time = datetime.utcnow()
-        self.logger.info(f"Starting execution")
+        # Cronometra só quando o log de INFO vai ser emitido
+        timed = self.logger.isEnabledFor(logging.INFO)
+        if timed:
+            start_time = time.perf_counter()
+            self.logger.info("Starting execution")
 
         try:
             # Inicializa se necessário
-            if not self._initialized:
-                await self.initialize()
-                self._initialized = True
+            await self.ensure_initialized()
 
             # Valida entrada
-            if not await self.validate_input(input_data):
+            if not self.validate_input(input_data):
                 raise AgentError(
                     "Invalid input data",
                     self.name,
@@ -117,15 +140,15 @@ class BaseAgent(ABC, Generic[InputT, OutputT]):
             result = await self.process(input_data)
 
             # Log de sucesso
-            elapsed = (datetime.utcnow() - start_time).total_seconds()
-            self.logger.info(f"Completed in {elapsed:.2f}s")
+            if timed:
+                self.logger.info("Completed in %.2fs", time.perf_counter() - start_time)
 
             return result
 
         except AgentError:
             raise
         except Exception as e:
-            self.logger.error(f"Unexpected error: {e}")
+            self.logger.exception("Unexpected error: %s", e)
             raise AgentError(str(e), self.name, recoverable=True)
 
     def get_status(self) -> Dict[str, Any]:
@@ -172,19 +195,19 @@ class StatefulAgent(BaseAgent[ComplaintState, ComplaintState]):
         Returns:
             Estado atualizado
         """
-        start_time = datetime.utcnow()
-        self.logger.info(
-            f"Processing complaint {state.complaint_raw.id or state.complaint_raw.external_id}"
-        )
+        # Cronometra só quando o log de INFO vai ser emitido
+        timed = self.logger.isEnabledFor(logging.INFO)
+        if timed:
+            start_time = time.perf_counter()
+            complaint_id = state.complaint_raw.id or state.complaint_raw.external_id
+            self.logger.info("Processing complaint %s", complaint_id)
 
         try:
             # Inicializa se necessário
-            if not self._initialized:
-                await self.initialize()
-                self._initialized = True
+            await self.ensure_initialized()
 
             # Valida entrada
-            if not await self.validate_input(state):
+            if not self.validate_input(state):
                 state.errors.append(f"[{self.name}] Invalid input state")
                 state.workflow_status = self.failure_status
                 return state
@@ -194,22 +217,24 @@ class StatefulAgent(BaseAgent[ComplaintState, ComplaintState]):
             result.workflow_status = self.success_status
 
             # Log de sucesso
-            elapsed = (datetime.utcnow() - start_time).total_seconds()
-            self.logger.info(
-                f"Completed {state.complaint_raw.id or state.complaint_raw.external_id} "
-                f"in {elapsed:.2f}s -> {self.success_status.value}"
-            )
+            if timed:
+                self.logger.info(
+                    "Completed %s in %.2fs -> %s",
+                    complaint_id,
+                    time.perf_counter() - start_time,
+                    self.success_status.value,
+                )
 
             return result
 
         except AgentError as e:
-            self.logger.error(f"Agent error: {e}")
+            self.logger.error("Agent error: %s", e)
             state.errors.append(f"[{self.name}] {e.message}")
             state.workflow_status = self.failure_status
             return state
 
         except Exception as e:
-            self.logger.error(f"Unexpected error: {e}")
+            self.logger.exception("Unexpected error: %s", e)
             state.errors.append(f"[{self.name}] Unexpected: {str(e)}")
             state.workflow_status = self.failure_status
             return state
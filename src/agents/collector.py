@@ -3,10 +3,11 @@ Agente Coletor (Collector Agent).
 Responsável por ingerir reclamações de múltiplas fontes.
 """
 
+import functools
 import logging
 import uuid
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional
 
 from src.agents.base import AgentError, BaseAgent
 from src.models.schemas import (
@@ -20,6 +21,9 @@ from src.services.mock_data_loader import get_data_loader
 
 logger = logging.getLogger(__name__)
 
+# Fontes aceitas (montado uma vez, não a cada validação)
+_VALID_SOURCES = frozenset(ComplaintSource)
+
 
 class CollectorAgent(BaseAgent[Optional[List[ComplaintSource]], List[ComplaintState]]):
     """
@@ -39,7 +43,7 @@ class CollectorAgent(BaseAgent[Optional[List[ComplaintSource]], List[ComplaintSt
         self.data_loader = get_data_loader()
         self.logger.info("Collector agent initialized with mock data loader")
 
-    async def validate_input(self, input_data: Optional[List[ComplaintSource]]) -> bool:
+    def validate_input(self, input_data: Optional[List[ComplaintSource]]) -> bool:
         """
         Valida as fontes de dados solicitadas.
 
@@ -53,10 +57,9 @@ class CollectorAgent(BaseAgent[Optional[List[ComplaintSource]], List[ComplaintSt
             return True
 
         # Verifica se todas as fontes são válidas
-        valid_sources = set(ComplaintSource)
         for source in input_data:
-            if source not in valid_sources:
-                self.logger.warning(f"Invalid source: {source}")
+            if source not in _VALID_SOURCES:
+                self.logger.warning("Invalid source: %s", source)
                 return False
         return True
 
@@ -72,53 +75,73 @@ class CollectorAgent(BaseAgent[Optional[List[ComplaintSource]], List[ComplaintSt
         Returns:
             Lista de ComplaintState prontos para processamento
         """
+        states = [state async for state in self.stream(sources)]
+
+        self.logger.info("Created %d complaint states", len(states))
+        return states
+
+    async def stream(
+        self, sources: Optional[List[ComplaintSource]] = None
+    ) -> AsyncIterator[ComplaintState]:
+        """
+        Entrega os ComplaintState um a um, conforme são criados.
+
+        Permite que o consumidor comece a trabalhar (ou pare, ao atingir um
+        limite) sem esperar a lista completa de estados.
+
+        Args:
+            sources: Lista de fontes ou None para todas
+
+        Yields:
+            ComplaintState pronto para processamento
+        """
         if self.data_loader is None:
             raise AgentError("Data loader not initialized", self.name)
 
         # Carrega reclamações brutas
         complaints = self.data_loader.load_all_complaints(sources)
-        self.logger.info(f"Loaded {len(complaints)} complaints from sources")
+        self.logger.info("Loaded %d complaints from sources", len(complaints))
 
-        # Converte para ComplaintState
-        states = []
         for complaint in complaints:
-            # Gera ID interno se não existir
-            if not complaint.id:
-                complaint.id = str(uuid.uuid4())
-
-            state = ComplaintState(
-                complaint_raw=complaint,
-                workflow_status=WorkflowStatus.NEW,
-                started_at=datetime.utcnow(),
-            )
-            states.append(state)
-
-        self.logger.info(f"Created {len(states)} complaint states")
-        return states
+            yield self._new_state(complaint)
 
-    async def collect_single(self, complaint: ComplaintRaw) -> ComplaintState:
+    def _new_state(self, complaint: ComplaintRaw) -> ComplaintState:
         """
-        Cria estado para uma reclamação individual.
-
-        Útil para processamento via API ou em tempo real.
+        Cria o estado inicial de uma reclamação, gerando ID interno se faltar.
 
         Args:
             complaint: Reclamação bruta
 
         Returns:
-            ComplaintState inicializado
+            ComplaintState com status NEW
         """
         if not complaint.id:
-            complaint.id = str(uuid.uuid4())
+            complaint.id = uuid.uuid4().hex
 
-        state = ComplaintState(
+        return ComplaintState(
             complaint_raw=complaint,
             workflow_status=WorkflowStatus.NEW,
-            started_at=datetime.utcnow(),
+            started_at=datetime.now(timezone.utc),
         )
 
+    async def collect_single(self, complaint: ComplaintRaw) -> ComplaintState:
+        """
+        Cria estado para uma reclamação individual.
+
+        Útil para processamento via API ou em tempo real.
+
+        Args:
+            complaint: Reclamação bruta
+
+        Returns:
+            ComplaintState inicializado
+        """
+        state = self._new_state(complaint)
+
         self.logger.info(
-            f"Created state for complaint {complaint.id} from {complaint.source.value}"
+            "Created state for complaint %s from %s",
+            complaint.id,
+            complaint.source.value,
         )
         return state
 
@@ -146,18 +169,12 @@ class CollectorAgent(BaseAgent[Optional[List[ComplaintSource]], List[ComplaintSt
         return self.data_loader.get_stats()
 
 
-# Singleton instance
-_collector: Optional[CollectorAgent] = None
-
-
+@functools.cache
 def get_collector_agent() -> CollectorAgent:
     """
     Factory function para obter o agente coletor.
 
     Returns:
-        Instância do CollectorAgent
+        Instância singleton do CollectorAgent (criada uma única vez)
     """
-    global _collector
-    if _collector is None:
-        _collector = CollectorAgent()
-    return _collector
+    return CollectorAgent()
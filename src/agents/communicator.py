@@ -3,11 +3,13 @@ Agente Comunicador (Communicator Agent).
 Responsável por criar tickets e enviar notificações.
 """
 
+import asyncio
+import functools
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
-from src.agents.base import AgentError, StatefulAgent
+from src.agents.base import AgentError, EmailError, JiraError, StatefulAgent
 from src.integrations.mock_email import get_email_client, MockEmailClient
 from src.integrations.mock_jira import get_jira_client, MockJiraClient
 from src.models.schemas import (
@@ -47,7 +49,7 @@ class CommunicatorAgent(StatefulAgent):
         self.email_client = get_email_client()
         self.logger.info("Communicator agent initialized with mock clients")
 
-    async def validate_input(self, state: ComplaintState) -> bool:
+    def validate_input(self, state: ComplaintState) -> bool:
         """
         Valida se o estado tem roteamento para criar ticket.
 
@@ -92,45 +94,48 @@ class CommunicatorAgent(StatefulAgent):
             ticket = await self._create_ticket(complaint_id, state)
             state.ticket_info = ticket
 
-            # Atualiza status para TICKET_CREATED
-            state.workflow_status = WorkflowStatus.TICKET_CREATED
-
             self.logger.info(
-                f"Created ticket {ticket.jira_key} for complaint {complaint_id}"
+                "Created ticket %s for complaint %s", ticket.jira_key, complaint_id
             )
 
-            # 2. Envia notificação para o time
-            team_notification = await self._notify_team(complaint_id, state)
-
-            # 3. Envia notificação para o cliente (se tiver contato)
-            customer_notification = await self._notify_customer(state)
+            # 2 e 3. Notifica time e cliente em paralelo (ambos só dependem do ticket)
+            team_notification, customer_notification = await asyncio.gather(
+                self._notify_team(complaint_id, state),
+                self._notify_customer(state),
+                return_exceptions=True,
+            )
+            for result in (team_notification, customer_notification):
+                if isinstance(result, BaseException):
+                    raise result
 
             # Registra primeira notificação (time)
             state.notification_info = team_notification
 
-            # Atualiza status para NOTIFIED
-            state.workflow_status = WorkflowStatus.NOTIFIED
-
-            # Marca como completo
+            # Marca como completo (status intermediários não chegam ao chamador)
             state.workflow_status = WorkflowStatus.COMPLETED
-            state.completed_at = datetime.utcnow()
+            state.completed_at = datetime.now(timezone.utc)
 
             self.logger.info(
-                f"Completed processing complaint {complaint_id}: "
-                f"ticket={ticket.jira_key}, "
-                f"team_notified={routing.responsible_email}"
+                "Completed processing complaint %s: ticket=%s, team_notified=%s",
+                complaint_id,
+                ticket.jira_key,
+                routing.responsible_email,
             )
 
             return state
 
-        except Exception as e:
-            # Determina tipo de falha
-            if "ticket" in str(e).lower() or "jira" in str(e).lower():
-                state.workflow_status = WorkflowStatus.FAILED_JIRA
-            else:
-                state.workflow_status = WorkflowStatus.FAILED_EMAIL
+        # O tipo da exceção define o status de falha
+        except JiraError as e:
+            state.workflow_status = WorkflowStatus.FAILED_JIRA
+            raise AgentError(
+                f"Communication failed: {e.message}", self.name, recoverable=True
+            ) from e
 
-            raise AgentError(f"Communication failed: {e}", self.name, recoverable=True)
+        except EmailError as e:
+            state.workflow_status = WorkflowStatus.FAILED_EMAIL
+            raise AgentError(
+                f"Communication failed: {e.message}", self.name, recoverable=True
+            ) from e
 
     async def _create_ticket(
         self, complaint_id: str, state: ComplaintState
@@ -146,13 +151,18 @@ class CommunicatorAgent(StatefulAgent):
             TicketInfo criado
         """
         if self.jira_client is None:
-            raise AgentError("Jira client not initialized", self.name)
+            raise JiraError("Jira client not initialized", self.name)
 
-        ticket = await self.jira_client.create_ticket(
-            complaint_id=complaint_id,
-            analysis=state.complaint_analyzed,
-            routing=state.routing_decision,
-        )
+        try:
+            ticket = await self.jira_client.create_ticket(
+                complaint_id=complaint_id,
+                analysis=state.complaint_analyzed,
+                routing=state.routing_decision,
+            )
+        except Exception as e:
+            raise JiraError(
+                f"Ticket creation failed: {e}", self.name, recoverable=True
+            ) from e
 
         return ticket
 
@@ -170,14 +180,19 @@ class CommunicatorAgent(StatefulAgent):
             NotificationInfo do envio
         """
         if self.email_client is None:
-            raise AgentError("Email client not initialized", self.name)
+            raise EmailError("Email client not initialized", self.name)
 
-        notification = await self.email_client.send_team_notification(
-            complaint_id=complaint_id,
-            complaint=state.complaint_raw,
-            routing=state.routing_decision,
-            ticket=state.ticket_info,
-        )
+        try:
+            notification = await self.email_client.send_team_notification(
+                complaint_id=complaint_id,
+                complaint=state.complaint_raw,
+                routing=state.routing_decision,
+                ticket=state.ticket_info,
+            )
+        except Exception as e:
+            raise EmailError(
+                f"Team notification failed: {e}", self.name, recoverable=True
+            ) from e
 
         return notification
 
@@ -196,14 +211,19 @@ class CommunicatorAgent(StatefulAgent):
         if self.email_client is None:
             return None
 
-        notification = await self.email_client.send_customer_notification(
-            complaint=state.complaint_raw,
-            ticket=state.ticket_info,
-        )
+        try:
+            notification = await self.email_client.send_customer_notification(
+                complaint=state.complaint_raw,
+                ticket=state.ticket_info,
+            )
+        except Exception as e:
+            raise EmailError(
+                f"Customer notification failed: {e}", self.name, recoverable=True
+            ) from e
 
         if notification:
             self.logger.info(
-                f"Customer notification sent to {state.complaint_raw.consumer_contact}"
+                "Customer notification sent to %s", state.complaint_raw.consumer_contact
             )
 
         return notification
@@ -229,18 +249,12 @@ class CommunicatorAgent(StatefulAgent):
         return stats
 
 
-# Singleton instance
-_communicator: Optional[CommunicatorAgent] = None
-
-
+@functools.cache
 def get_communicator_agent() -> CommunicatorAgent:
     """
     Factory function para obter o agente comunicador.
 
     Returns:
-        Instância do CommunicatorAgent
+        Instância singleton do CommunicatorAgent (criada uma única vez)
     """
-    global _communicator
-    if _communicator is None:
-        _communicator = CommunicatorAgent()
-    return _communicator
+    return CommunicatorAgent()
@@ -3,14 +3,16 @@ Agente de Privacidade para conformidade LGPD.
 Responsável por anonimizar dados pessoais antes do processamento LLM.
 """
 
+import functools
 import re
-from copy import deepcopy
-from typing import Tuple
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate
+from typing import List, Tuple
 
 from src.agents.base import BaseAgent
 from src.models.schemas import ComplaintRaw, ComplaintState, WorkflowStatus
 
-
 # Padrões de PII para mascaramento
 # IMPORTANTE: A ordem importa! Padrões mais específicos devem vir antes.
 # Usamos lista de tuplas para garantir a ordem de processamento.
@@ -38,6 +40,41 @@ PII_PATTERNS = [
 ]
 
 
+# Padrões compilados uma vez no import, aplicados em passadas sequenciais na
+# ordem da lista. Não dá para fundir numa alternação única: nela um padrão
+# genérico que casa mais cedo no texto consome dígitos que o cartão/CPF
+# precisariam, e parte do dado escapa da máscara.
+_COMPILED_PII_PATTERNS = [
+    (name, re.compile(pattern), replacement)
+    for name, (pattern, replacement) in PII_PATTERNS
+]
+
+# Pré-filtro: todo padrão numérico exige ao menos 10 dígitos (telefone fixo
+# com DDD) e o de email exige "@". Textos abaixo disso não têm PII possível.
+MIN_PII_DIGITS = 10
+_NON_DIGIT_BYTES = bytes(b for b in range(256) if not 48 <= b <= 57)
+
+
+# Separador usado no mascaramento em lote (nenhum padrão casa "\x00")
+_BATCH_SEPARATOR = "\x00"
+
+
+def _may_contain_pii(text: str) -> bool:
+    """
+    Descarta rápido textos que nenhum padrão pode casar.
+
+    O \\d dos padrões casa dígitos Unicode (ex: largura total); só texto
+    ASCII usa a contagem rápida de bytes, o resto conta com str.isdigit.
+    """
+    if "@" in text:
+        return True
+    if text.isascii():
+        digits = len(text.encode("ascii").translate(None, _NON_DIGIT_BYTES))
+    else:
+        digits = sum(c.isdigit() for c in text)
+    return digits >= MIN_PII_DIGITS
+
+
 class PrivacyAgent(BaseAgent[ComplaintRaw, ComplaintRaw]):
     """
     Agente responsável por anonimizar PII para conformidade LGPD.
@@ -51,18 +88,15 @@ class PrivacyAgent(BaseAgent[ComplaintRaw, ComplaintRaw]):
 
     def __init__(self):
         super().__init__("privacy")
-        # Mantém a ordem dos padrões usando lista
-        self._patterns = [
-            (name, (re.compile(pattern), replacement))
-            for name, (pattern, replacement) in PII_PATTERNS
-        ]
+        # Mantém a ordem dos padrões (compilados no import do módulo)
+        self._patterns = _COMPILED_PII_PATTERNS
 
     async def initialize(self) -> None:
         """Inicializa o agente (nenhum recurso externo necessário)."""
         self.logger.info("Privacy agent initialized")
         self._initialized = True
 
-    async def validate_input(self, input_data: ComplaintRaw) -> bool:
+    def validate_input(self, input_data: ComplaintRaw) -> bool:
         """Valida se a entrada é uma ComplaintRaw válida."""
         return (
             input_data is not None
@@ -80,22 +114,83 @@ class PrivacyAgent(BaseAgent[ComplaintRaw, ComplaintRaw]):
         Returns:
             Tupla (texto mascarado, número de substituições)
         """
-        if not text:
+        if not text or not _may_contain_pii(text):
             return text, 0
 
         total_replacements = 0
         masked_text = text
 
         # Processa na ordem definida (mais específico primeiro)
-        for name, (pattern, replacement) in self._patterns:
-            new_text, count = pattern.subn(replacement, masked_text)
+        for name, pattern, replacement in self._patterns:
+            masked_text, count = pattern.subn(replacement, masked_text)
             if count > 0:
-                self.logger.debug(f"Masked {count} {name}(s)")
+                self.logger.debug("Masked %d %s(s)", count, name)
                 total_replacements += count
-            masked_text = new_text
 
         return masked_text, total_replacements
 
+    def mask_many(self, texts: List[str]) -> List[Tuple[str, int]]:
+        """
+        Mascara PII de vários textos com uma passada de regex por padrão.
+
+        Os textos que podem conter PII são unidos por um separador que nenhum
+        padrão consegue casar, mascarados de uma vez (na mesma ordem de
+        padrões de _mask_pii) e separados de volta.
+
+        Args:
+            texts: Textos a serem processados
+
+        Returns:
+            Lista de tuplas (texto mascarado, número de substituições), na
+            mesma ordem da entrada
+        """
+        results: List[Tuple[str, int]] = [(text, 0) for text in texts]
+
+        candidates = [
+            i for i, text in enumerate(texts)
+            if text and _may_contain_pii(text)
+        ]
+        if not candidates:
+            return results
+
+        # Separador presente em algum texto: processa um a um
+        if any(_BATCH_SEPARATOR in texts[i] for i in candidates):
+            for i in candidates:
+                results[i] = self._mask_pii(texts[i])
+            return results
+
+        parts = [texts[i] for i in candidates]
+        joined = _BATCH_SEPARATOR.join(parts)
+        counts = [0] * len(candidates)
+        by_category: Counter = Counter()
+
+        for name, pattern, replacement in self._patterns:
+            # Offset de início de cada texto no bloco, para atribuir as contagens
+            offsets = list(accumulate(
+                (len(part) + len(_BATCH_SEPARATOR) for part in parts[:-1]),
+                initial=0,
+            ))
+
+            def replace(match) -> str:
+                counts[bisect_right(offsets, match.start()) - 1] += 1
+                return replacement
+
+            joined, count = pattern.subn(replace, joined)
+            if count > 0:
+                by_category[name] += count
+                parts = joined.split(_BATCH_SEPARATOR)
+
+        for slot, i in enumerate(candidates):
+            results[i] = (parts[slot], counts[slot])
+
+        total = sum(counts)
+        if total > 0:
+            self.logger.debug(
+                "Masked %s across %d texts", dict(by_category), len(candidates)
+            )
+
+        return results
+
     async def process(self, complaint: ComplaintRaw) -> ComplaintRaw:
         """
         Processa uma reclamação e retorna cópia com PII mascarado.
@@ -106,31 +201,85 @@ class PrivacyAgent(BaseAgent[ComplaintRaw, ComplaintRaw]):
         Returns:
             Cópia da reclamação com dados anonimizados
         """
-        # Cria cópia profunda para não modificar o original
-        anonymized = deepcopy(complaint)
+        # Descrição, título e contato mascarados num único bloco (mask_many)
+        (description, c1), (title, c2), (consumer_contact, c3) = self.mask_many([
+            complaint.description,
+            complaint.title,
+            complaint.consumer_contact,
+        ])
+        total_masked = c1 + c2 + c3
+
+        # Cópia com os campos mascarados; os demais campos são imutáveis
+        # (str, enum, datetime), então a cópia rasa não expõe o original
+        anonymized = complaint.model_copy(update={
+            "description": description,
+            "title": title,
+            "consumer_contact": consumer_contact,
+        })
 
-        total_masked = 0
+        self.logger.info(
+            "Anonymized complaint %s: %d PII(s) masked",
+            complaint.id or complaint.external_id,
+            total_masked,
+        )
+
+        return anonymized
 
-        # Mascara descrição (campo principal)
-        anonymized.description, count = self._mask_pii(anonymized.description)
-        total_masked += count
+    async def process_many(self, complaints: List[ComplaintRaw]) -> List[ComplaintRaw]:
+        """
+        Anonimiza um lote de reclamações mascarando todos os textos num único bloco.
 
-        # Mascara título se existir
-        if anonymized.title:
-            anonymized.title, count = self._mask_pii(anonymized.title)
-            total_masked += count
+        Args:
+            complaints: Reclamações originais
 
-        # Mascara contato do consumidor
-        if anonymized.consumer_contact:
-            anonymized.consumer_contact, count = self._mask_pii(anonymized.consumer_contact)
-            total_masked += count
+        Returns:
+            Cópias anonimizadas, na mesma ordem da entrada
+        """
+        # Descrição, título e contato de cada reclamação, em sequência
+        texts: List[str] = []
+        for complaint in complaints:
+            texts.extend((
+                complaint.description,
+                complaint.title,
+                complaint.consumer_contact,
+            ))
+
+        masked = self.mask_many(texts)
+
+        anonymized_list = []
+        total_masked = 0
+        for i, complaint in enumerate(complaints):
+            (description, c1), (title, c2), (contact, c3) = masked[3 * i:3 * i + 3]
+            total_masked += c1 + c2 + c3
+            anonymized_list.append(complaint.model_copy(update={
+                "description": description,
+                "title": title,
+                "consumer_contact": contact,
+            }))
 
         self.logger.info(
-            f"Anonymized complaint {complaint.id or complaint.external_id}: "
-            f"{total_masked} PII(s) masked"
+            "Anonymized %d complaints: %d PII(s) masked", len(complaints), total_masked
         )
 
-        return anonymized
+        return anonymized_list
+
+    async def process_states(self, states: List[ComplaintState]) -> List[ComplaintState]:
+        """
+        Anonimiza um lote de estados do workflow de uma só vez.
+
+        Args:
+            states: Estados atuais do workflow
+
+        Returns:
+            Estados atualizados com complaint_anonymized preenchido
+        """
+        anonymized_list = await self.process_many([s.complaint_raw for s in states])
+
+        for state, anonymized in zip(states, anonymized_list):
+            state.complaint_anonymized = anonymized
+            state.workflow_status = WorkflowStatus.ANONYMIZED
+
+        return states
 
     async def process_state(self, state: ComplaintState) -> ComplaintState:
         """
@@ -152,18 +301,12 @@ class PrivacyAgent(BaseAgent[ComplaintRaw, ComplaintRaw]):
         return state
 
 
-# Singleton instance
-_privacy_agent = None
-
-
+@functools.cache
 def get_privacy_agent() -> PrivacyAgent:
     """
     Factory function para obter o agente de privacidade.
 
     Returns:
-        Instância do PrivacyAgent
+        Instância singleton do PrivacyAgent (criada uma única vez)
     """
-    global _privacy_agent
-    if _privacy_agent is None:
-        _privacy_agent = PrivacyAgent()
-    return _privacy_agent
+    return PrivacyAgent()
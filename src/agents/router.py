@@ -3,15 +3,20 @@ Agente Roteador (Router Agent).
 Responsável por rotear reclamações para o time correto usando RAG.
 """
 
+import functools
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
 
 from src.agents.base import AgentError, StatefulAgent
 from src.models.schemas import (
+    ComplaintCategory,
+    ComplaintRaw,
     ComplaintState,
     Priority,
     RoutingDecision,
+    Sentiment,
     TeamInfo,
     Urgency,
     WorkflowStatus,
@@ -21,6 +26,29 @@ from src.utils.prompts import PromptTemplates
 
 logger = logging.getLogger(__name__)
 
+# Máximo de consultas RAG cujo time escolhido fica em memória
+RAG_CACHE_SIZE = 1024
+
+# Times candidatos buscados no RAG antes da análise
+PREFETCH_TOP_K = 3
+
+# Matriz de prioridade: (urgência, sentimento) -> prioridade.
+# Cliente muito insatisfeito sobe um nível; urgência crítica é sempre crítica.
+_PRIORITY_TABLE: Dict[Tuple[Urgency, str], Priority] = {
+    (Urgency.CRITICA, Sentiment.NEUTRO.value): Priority.CRITICAL,
+    (Urgency.CRITICA, Sentiment.INSATISFEITO.value): Priority.CRITICAL,
+    (Urgency.CRITICA, Sentiment.MUITO_INSATISFEITO.value): Priority.CRITICAL,
+    (Urgency.ALTA, Sentiment.NEUTRO.value): Priority.HIGH,
+    (Urgency.ALTA, Sentiment.INSATISFEITO.value): Priority.HIGH,
+    (Urgency.ALTA, Sentiment.MUITO_INSATISFEITO.value): Priority.CRITICAL,
+    (Urgency.MEDIA, Sentiment.NEUTRO.value): Priority.MEDIUM,
+    (Urgency.MEDIA, Sentiment.INSATISFEITO.value): Priority.MEDIUM,
+    (Urgency.MEDIA, Sentiment.MUITO_INSATISFEITO.value): Priority.HIGH,
+    (Urgency.BAIXA, Sentiment.NEUTRO.value): Priority.LOW,
+    (Urgency.BAIXA, Sentiment.INSATISFEITO.value): Priority.LOW,
+    (Urgency.BAIXA, Sentiment.MUITO_INSATISFEITO.value): Priority.MEDIUM,
+}
+
 
 class RouterAgent(StatefulAgent):
     """
@@ -45,6 +73,14 @@ class RouterAgent(StatefulAgent):
         self.use_azure_search = use_azure_search
         self.teams: List[TeamInfo] = []
         self.category_to_team: Dict[str, TeamInfo] = {}
+        self._route_table: Dict[str, TeamInfo] = {}
+        self._fallback_team: Optional[TeamInfo] = None
+        self._team_by_id: Dict[str, TeamInfo] = {}
+        self._team_names: List[str] = []
+        self._team_expertise: Dict[str, str] = {}
+        self._decision_table: Dict[Tuple[Urgency, str, str], Tuple[Priority, int]] = {}
+        # Cache LRU consulta RAG -> time (consultas idênticas escolhem o mesmo time)
+        self._rag_cache: "OrderedDict[str, TeamInfo]" = OrderedDict()
         self.search_client = None
 
     async def initialize(self) -> None:
@@ -52,15 +88,41 @@ class RouterAgent(StatefulAgent):
         # Carrega times do mock data
         loader = get_data_loader()
         self.teams = loader.load_teams()
+        self._team_by_id = {team.id: team for team in self.teams}
+        self._team_names = [team.name for team in self.teams]
+        # Trecho de expertise da justificativa, montado uma vez por time
+        self._team_expertise = {
+            team.id: ", ".join(team.responsibilities[:3]) for team in self.teams
+        }
 
         # Cria mapeamento categoria -> time
         for team in self.teams:
             for category in team.categories:
                 self.category_to_team[category.lower()] = team
 
+        # Resolve de antemão (busca exata ou parcial) cada categoria que a
+        # análise pode produzir, e o time de fallback
+        self._route_table = {}
+        for category in ComplaintCategory:
+            team = self._match_category(category.value.lower())
+            if team is not None:
+                self._route_table[category.value] = team
+        self._fallback_team = self._find_fallback_team()
+
+        # (urgência, sentimento, time) -> (prioridade, SLA) para todas as combinações
+        self._decision_table = {
+            (urgency, sentiment, team.id): (
+                priority,
+                self._get_sla_hours(team, urgency.value),
+            )
+            for (urgency, sentiment), priority in _PRIORITY_TABLE.items()
+            for team in self.teams
+        }
+
         self.logger.info(
-            f"Router agent initialized with {len(self.teams)} teams, "
-            f"{len(self.category_to_team)} category mappings"
+            "Router agent initialized with %d teams, %d category mappings",
+            len(self.teams),
+            len(self.category_to_team),
         )
 
         # Inicializa Azure Search se configurado
@@ -71,11 +133,11 @@ class RouterAgent(StatefulAgent):
                 self.logger.info("Azure AI Search client initialized for RAG")
             except Exception as e:
                 self.logger.warning(
-                    f"Failed to initialize Azure Search, using local routing: {e}"
+                    "Failed to initialize Azure Search, using local routing: %s", e
                 )
                 self.use_azure_search = False
 
-    async def validate_input(self, state: ComplaintState) -> bool:
+    def validate_input(self, state: ComplaintState) -> bool:
         """
         Valida se o estado tem análise para roteamento.
 
@@ -111,11 +173,14 @@ class RouterAgent(StatefulAgent):
         complaint_id = complaint.id or complaint.external_id
 
         try:
-            # Encontra time apropriado
-            if self.use_azure_search and self.search_client:
-                team = await self._route_with_rag(state)
-            else:
-                team = await self._route_with_mapping(state)
+            # Encontra time apropriado: primeiro entre os candidatos
+            # pré-buscados (em paralelo com a análise), depois RAG/mapeamento
+            team = self._pick_candidate(state)
+            if team is None:
+                if self.use_azure_search and self.search_client:
+                    team = await self._route_with_rag(state)
+                else:
+                    team = self._route_with_mapping(state)
 
             if not team:
                 raise AgentError(
@@ -124,11 +189,17 @@ class RouterAgent(StatefulAgent):
                     recoverable=False
                 )
 
-            # Determina prioridade baseada na análise
-            priority = self._determine_priority(analysis.urgency, analysis.sentiment.value)
-
-            # Calcula SLA
-            sla_hours = self._get_sla_hours(team, analysis.urgency.value)
+            # Prioridade e SLA pré-calculados; times vindos do RAG que não
+            # estão no índice local são calculados na hora
+            decision = self._decision_table.get(
+                (analysis.urgency, analysis.sentiment.value, team.id)
+            )
+            if decision is None:
+                decision = (
+                    self._determine_priority(analysis.urgency, analysis.sentiment.value),
+                    self._get_sla_hours(team, analysis.urgency.value),
+                )
+            priority, sla_hours = decision
 
             # Gera justificativa
             justification = self._generate_justification(analysis, team)
@@ -142,14 +213,17 @@ class RouterAgent(StatefulAgent):
                 priority=priority,
                 justification=justification,
                 sla_hours=sla_hours,
-                routed_at=datetime.utcnow(),
+                routed_at=datetime.now(timezone.utc),
             )
 
             state.routing_decision = routing
 
             self.logger.info(
-                f"Routed complaint {complaint_id} to team '{team.name}' "
-                f"(priority={priority.value}, SLA={sla_hours}h)"
+                "Routed complaint %s to team '%s' (priority=%s, SLA=%dh)",
+                complaint_id,
+                team.name,
+                priority.value,
+                sla_hours,
             )
 
             return state
@@ -159,7 +233,7 @@ class RouterAgent(StatefulAgent):
         except Exception as e:
             raise AgentError(f"Routing failed: {e}", self.name, recoverable=True)
 
-    async def _route_with_mapping(self, state: ComplaintState) -> Optional[TeamInfo]:
+    def _route_with_mapping(self, state: ComplaintState) -> Optional[TeamInfo]:
         """
         Roteia usando mapeamento local categoria->time.
 
@@ -169,8 +243,34 @@ class RouterAgent(StatefulAgent):
         Returns:
             TeamInfo ou None
         """
-        category = state.complaint_analyzed.category.value.lower()
+        analysis = state.complaint_analyzed
+        category = analysis.category.value
+
+        # Categorias conhecidas já vêm resolvidas do initialize()
+        team = self._route_table.get(category)
+        if team is None:
+            team = self._match_category(analysis.category_lower)
+        if team is not None:
+            return team
+
+        if self._fallback_team is not None:
+            self.logger.warning(
+                "Using fallback team '%s' for category '%s'",
+                self._fallback_team.name,
+                category,
+            )
+        return self._fallback_team
+
+    def _match_category(self, category: str) -> Optional[TeamInfo]:
+        """
+        Busca o time de uma categoria (exata, depois parcial).
 
+        Args:
+            category: Categoria em minúsculas
+
+        Returns:
+            TeamInfo ou None se nenhuma categoria de time corresponder
+        """
         # Busca exata
         if category in self.category_to_team:
             return self.category_to_team[category]
@@ -180,16 +280,63 @@ class RouterAgent(StatefulAgent):
             if category in cat_key or cat_key in category:
                 return team
 
-        # Fallback: retorna time de Atendimento N2
+        return None
+
+    def _find_fallback_team(self) -> Optional[TeamInfo]:
+        """
+        Escolhe o time de fallback (Atendimento N2 ou o primeiro time).
+
+        Returns:
+            TeamInfo ou None se não houver times
+        """
         for team in self.teams:
-            if "atendimento" in team.name.lower() or "n2" in team.name.lower():
-                self.logger.warning(
-                    f"Using fallback team '{team.name}' for category '{category}'"
-                )
+            name = team.name.lower()
+            if "atendimento" in name or "n2" in name:
                 return team
 
         return self.teams[0] if self.teams else None
 
+    async def prefetch_teams(self, complaint: ComplaintRaw) -> List[TeamInfo]:
+        """
+        Busca times candidatos no RAG só pelo texto da reclamação.
+
+        Não depende da análise, então pode rodar em paralelo com o analista;
+        o process escolhe entre eles o que atende a categoria classificada.
+
+        Args:
+            complaint: Reclamação (anonimizada)
+
+        Returns:
+            Times candidatos (vazio sem Azure Search ou em caso de erro)
+        """
+        if not (self.use_azure_search and self.search_client):
+            return []
+
+        try:
+            return await self.search_client.search_team(
+                query=f"{complaint.title}. {complaint.description}",
+                top_k=PREFETCH_TOP_K,
+            )
+        except Exception as e:
+            self.logger.warning("RAG prefetch failed: %s", e)
+            return []
+
+    def _pick_candidate(self, state: ComplaintState) -> Optional[TeamInfo]:
+        """
+        Escolhe, entre os times pré-buscados, o primeiro que atende a categoria.
+
+        Args:
+            state: Estado com análise e team_candidates
+
+        Returns:
+            TeamInfo ou None
+        """
+        category = state.complaint_analyzed.category.value
+        for team in state.team_candidates:
+            if category in team.categories:
+                return team
+        return None
+
     async def _route_with_rag(self, state: ComplaintState) -> Optional[TeamInfo]:
         """
         Roteia usando Azure AI Search (RAG).
@@ -209,6 +356,11 @@ class RouterAgent(StatefulAgent):
             summary=analysis.summary,
         )
 
+        cached = self._rag_cache.get(query)
+        if cached is not None:
+            self._rag_cache.move_to_end(query)
+            return cached
+
         try:
             # Busca times relevantes
             teams = await self.search_client.search_team(
@@ -218,15 +370,18 @@ class RouterAgent(StatefulAgent):
             )
 
             if teams:
+                self._rag_cache[query] = teams[0]
+                if len(self._rag_cache) > RAG_CACHE_SIZE:
+                    self._rag_cache.popitem(last=False)
                 return teams[0]
 
             # Fallback para mapeamento local
             self.logger.warning("RAG search returned no results, using local mapping")
-            return await self._route_with_mapping(state)
+            return self._route_with_mapping(state)
 
         except Exception as e:
-            self.logger.error(f"RAG search failed: {e}")
-            return await self._route_with_mapping(state)
+            self.logger.error("RAG search failed: %s", e)
+            return self._route_with_mapping(state)
 
     def _determine_priority(self, urgency: Urgency, sentiment: str) -> Priority:
         """
@@ -239,24 +394,7 @@ class RouterAgent(StatefulAgent):
         Returns:
             Priority apropriada
         """
-        # Matriz de prioridade
-        if urgency == Urgency.CRITICA:
-            return Priority.CRITICAL
-
-        if urgency == Urgency.ALTA:
-            if sentiment == "muito_insatisfeito":
-                return Priority.CRITICAL
-            return Priority.HIGH
-
-        if urgency == Urgency.MEDIA:
-            if sentiment == "muito_insatisfeito":
-                return Priority.HIGH
-            return Priority.MEDIUM
-
-        # Urgência baixa
-        if sentiment == "muito_insatisfeito":
-            return Priority.MEDIUM
-        return Priority.LOW
+        return _PRIORITY_TABLE.get((urgency, sentiment), Priority.LOW)
 
     def _get_sla_hours(self, team: TeamInfo, urgency: str) -> int:
         """
@@ -269,16 +407,8 @@ class RouterAgent(StatefulAgent):
         Returns:
             Horas do SLA
         """
-        # Mapeamento de urgência para chave do SLA
-        urgency_mapping = {
-            "baixa": "baixa",
-            "media": "media",
-            "alta": "alta",
-            "critica": "critica",
-        }
-
-        sla_key = urgency_mapping.get(urgency, "media")
-        return team.sla_hours.get(sla_key, 48)
+        # As chaves do SLA são os próprios valores de urgência
+        return team.sla_hours.get(urgency, 48)
 
     def _generate_justification(
         self, analysis, team: TeamInfo
@@ -293,40 +423,38 @@ class RouterAgent(StatefulAgent):
         Returns:
             Texto de justificativa
         """
+        # Times vindos do RAG podem não estar no índice local
+        expertise = self._team_expertise.get(team.id)
+        if expertise is None:
+            expertise = ", ".join(team.responsibilities[:3])
+
         return (
             f"Reclamação classificada como '{analysis.category.value}' "
             f"com urgência '{analysis.urgency.value}'. "
             f"Time '{team.name}' é responsável por esta categoria e possui "
-            f"expertise em: {', '.join(team.responsibilities[:3])}."
+            f"expertise em: {expertise}."
         )
 
     def get_available_teams(self) -> List[str]:
-        """Retorna lista de times disponíveis."""
-        return [team.name for team in self.teams]
+        """Retorna lista de times disponíveis (montada no initialize)."""
+        return self._team_names
 
     def get_team_by_id(self, team_id: str) -> Optional[TeamInfo]:
         """Busca time por ID."""
-        for team in self.teams:
-            if team.id == team_id:
-                return team
-        return None
-
-
-# Singleton instance
-_router: Optional[RouterAgent] = None
+        return self._team_by_id.get(team_id)
 
 
+@functools.cache
 def get_router_agent(use_azure_search: bool = False) -> RouterAgent:
     """
     Factory function para obter o agente roteador.
 
+    Uma instância por configuração, criada uma única vez.
+
     Args:
         use_azure_search: Se True, habilita RAG com Azure AI Search
 
     Returns:
         Instância do RouterAgent
     """
-    global _router
-    if _router is None:
-        _router = RouterAgent(use_azure_search=use_azure_search)
-    return _router
+    return RouterAgent(use_azure_search=use_azure_search)
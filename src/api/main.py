@@ -3,6 +3,7 @@ API Principal do ReclamaAI.
 FastAPI application com endpoints para processamento de reclamações.
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -52,10 +53,22 @@ async def lifespan(app: FastAPI):
         logger.info("LangSmith Tracing: DISABLED")
         logger.info("  Configure LANGCHAIN_API_KEY e LANGCHAIN_TRACING_V2=true para habilitar")
 
+    # Fila de lotes consumida por workers dedicados (POST /complaints/process)
+    app.state.batch_queue = asyncio.Queue(maxsize=settings.batch_queue_size)
+    workers = [
+        asyncio.create_task(complaints.batch_worker(app.state.batch_queue))
+        for _ in range(max(1, settings.batch_workers))
+    ]
+    logger.info(f"Batch workers: {len(workers)}")
+
     logger.info("=" * 60)
     yield
     logger.info("Encerrando ReclamaAI API...")
 
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+
 
 app = FastAPI(
     title="ReclamaAI",
@@ -64,13 +77,13 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# CORS
+# CORS (métodos e cabeçalhos explícitos: a API só expõe GET e POST com JSON)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=settings.allowed_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
 )
 
 # Rotas
@@ -3,13 +3,17 @@ Endpoints para gerenciamento de reclamações.
 Usa Azure Cosmos DB para persistência.
 """
 
+import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
+import orjson
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from src.core.config import get_settings
 from src.models.schemas import (
     ComplaintRaw,
     ComplaintSource,
@@ -23,6 +27,10 @@ from src.services.cosmos_service import get_cosmos_service
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Fontes válidas por valor (montado uma vez no import)
+_SOURCES_BY_VALUE: Dict[str, ComplaintSource] = {s.value: s for s in ComplaintSource}
+_SOURCE_VALUES: List[str] = list(_SOURCES_BY_VALUE)
+
 
 class ProcessRequest(BaseModel):
     """Request para processar reclamações."""
@@ -59,6 +67,28 @@ class StatsResponse(BaseModel):
     by_team: Dict[str, int]
 
 
+def _complaint_summary(c: ComplaintState) -> Dict[str, Any]:
+    """
+    Monta o resumo de uma reclamação como dict com os campos de ComplaintSummary.
+
+    Args:
+        c: Estado da reclamação
+
+    Returns:
+        Dict pronto para validação/serialização pelo response_model
+    """
+    return {
+        "id": c.complaint_raw.id or c.complaint_raw.external_id,
+        "title": c.complaint_raw.title,
+        "source": c.complaint_raw.source.value,
+        "status": c.workflow_status.value,
+        "category": c.complaint_analyzed.category.value if c.complaint_analyzed else None,
+        "team": c.routing_decision.team if c.routing_decision else None,
+        "ticket": c.ticket_info.jira_key if c.ticket_info else None,
+        "processed_at": c.completed_at,
+    }
+
+
 async def _ensure_cosmos_initialized():
     """Garante que o CosmosService está inicializado."""
     cosmos = get_cosmos_service()
@@ -73,10 +103,34 @@ async def list_complaints(
     status: Optional[str] = Query(None, description="Filtrar por status"),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    stream: bool = Query(False, description="Entrega NDJSON conforme as páginas chegam"),
 ):
     """Lista reclamações processadas com filtros opcionais."""
     cosmos = await _ensure_cosmos_initialized()
 
+    if stream:
+        items = cosmos.iter_complaints(
+            source=source,
+            status=status,
+            limit=limit,
+            offset=offset,
+        )
+
+        # A primeira página é buscada antes de enviar os cabeçalhos, para
+        # que falhas de conexão/consulta ainda virem um 500 de verdade
+        try:
+            first = await anext(items)
+        except StopAsyncIteration:
+            first = None
+        except Exception as e:
+            logger.error("Failed to stream complaints: %s", e)
+            raise HTTPException(status_code=500, detail=str(e))
+
+        return StreamingResponse(
+            _stream_summaries(first, items),
+            media_type="application/x-ndjson",
+        )
+
     try:
         complaints = await cosmos.list_complaints(
             source=source,
@@ -85,28 +139,45 @@ async def list_complaints(
             offset=offset,
         )
 
-        # Converte para resumo
-        summaries = []
-        for c in complaints:
-            summary = ComplaintSummary(
-                id=c.complaint_raw.id or c.complaint_raw.external_id,
-                title=c.complaint_raw.title,
-                source=c.complaint_raw.source.value,
-                status=c.workflow_status.value,
-                category=c.complaint_analyzed.category.value if c.complaint_analyzed else None,
-                team=c.routing_decision.team if c.routing_decision else None,
-                ticket=c.ticket_info.jira_key if c.ticket_info else None,
-                processed_at=c.completed_at,
-            )
-            summaries.append(summary)
-
-        return summaries
+        # Dicts simples: o response_model (compilado uma vez pelo FastAPI)
+        # valida e serializa direto, sem instanciar ComplaintSummary aqui
+        return [_complaint_summary(c) for c in complaints]
 
     except Exception as e:
-        logger.error(f"Failed to list complaints: {e}")
+        logger.error("Failed to list complaints: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _stream_summaries(
+    first: Optional[ComplaintState],
+    items: AsyncIterator[ComplaintState],
+) -> AsyncIterator[bytes]:
+    """
+    Gera uma linha NDJSON por reclamação, página a página do Cosmos DB.
+
+    Args:
+        first: Primeira reclamação, já buscada pela rota (None se vazio)
+        items: Iterador com as reclamações restantes
+
+    Raises:
+        Exception: Falhas após o início do stream são relançadas para
+            abortar a conexão, em vez de entregar uma lista truncada
+    """
+    if first is None:
+        return
+
+    yield orjson.dumps(_complaint_summary(first)) + b"\n"
+
+    try:
+        async for c in items:
+            yield orjson.dumps(_complaint_summary(c)) + b"\n"
+
+    except Exception as e:
+        # Cabeçalhos já enviados: registra e relança para abortar a conexão
+        logger.error("Failed to stream complaints: %s", e)
+        raise
+
+
 @router.get("/complaints/available", response_model=Dict[str, Any])
 async def list_available_complaints(
     source: Optional[str] = Query(None, description="Filtrar por fonte"),
@@ -117,13 +188,13 @@ async def list_available_complaints(
 
     sources = None
     if source:
-        try:
-            sources = [ComplaintSource(source)]
-        except ValueError:
+        source_enum = _SOURCES_BY_VALUE.get(source)
+        if source_enum is None:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid source: {source}. Valid sources: {[s.value for s in ComplaintSource]}"
+                detail=f"Invalid source: {source}. Valid sources: {_SOURCE_VALUES}"
             )
+        sources = [source_enum]
 
     complaints = loader.load_all_complaints(sources)
     complaints = complaints[:limit]
@@ -159,31 +230,47 @@ async def get_complaint(complaint_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get complaint {complaint_id}: {e}")
+        logger.error("Failed to get complaint %s: %s", complaint_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/complaints/process", response_model=ProcessResponse)
 async def process_complaints(
+    http_request: Request,
     background_tasks: BackgroundTasks,
     request: ProcessRequest = ProcessRequest(),
 ):
     """
     Dispara o processamento de reclamações em background.
 
+    O lote entra na fila consumida pelos workers iniciados no lifespan da
+    API; sem a fila (router montado em outra app), usa BackgroundTasks.
+
     Args:
+        http_request: Request HTTP (acesso ao estado da app)
+        background_tasks: Tarefas em background do FastAPI
         request: Configurações de processamento
     """
-    orchestrator = get_orchestrator()
-
-    # Adiciona tarefa em background
-    background_tasks.add_task(
-        _process_batch,
-        orchestrator,
-        request.source,
-        request.limit or 10,
+    batch_queue: Optional[asyncio.Queue] = getattr(
+        http_request.app.state, "batch_queue", None
     )
 
+    if batch_queue is not None:
+        try:
+            batch_queue.put_nowait((request.source, request.limit or 10))
+        except asyncio.QueueFull:
+            raise HTTPException(
+                status_code=503,
+                detail="Batch queue is full, try again later",
+            )
+    else:
+        background_tasks.add_task(
+            _process_batch,
+            get_orchestrator(),
+            request.source,
+            request.limit or 10,
+        )
+
     return ProcessResponse(
         message="Processing started in background",
         source=request.source or "all",
@@ -192,6 +279,21 @@ async def process_complaints(
     )
 
 
+async def batch_worker(queue: asyncio.Queue) -> None:
+    """
+    Consome lotes da fila de processamento até ser cancelado.
+
+    Args:
+        queue: Fila de tuplas (source_filter, limit)
+    """
+    while True:
+        source_filter, limit = await queue.get()
+        try:
+            await _process_batch(get_orchestrator(), source_filter, limit)
+        finally:
+            queue.task_done()
+
+
 async def _process_batch(
     orchestrator,
     source_filter: Optional[str],
@@ -199,7 +301,7 @@ async def _process_batch(
 ):
     """Processa lote de reclamações (executa em background)."""
     try:
-        logger.info(f"Starting batch processing: source={source_filter}, limit={limit}")
+        logger.info("Starting batch processing: source=%s, limit=%s", source_filter, limit)
 
         # Cosmos service para persistência
         cosmos = await _ensure_cosmos_initialized()
@@ -209,17 +311,27 @@ async def _process_batch(
             source_filter=source_filter,
         )
 
-        # Salva resultados no Cosmos DB
-        for state in results:
-            try:
-                await cosmos.save_complaint(state)
-            except Exception as e:
-                logger.error(f"Failed to save complaint to Cosmos: {e}")
+        # Salva resultados no Cosmos DB em paralelo, limitando gravações simultâneas
+        semaphore = asyncio.Semaphore(max(1, get_settings().cosmos_save_concurrency))
 
-        logger.info(f"Batch processing completed: {len(results)} complaints processed and saved")
+        async def save(state: ComplaintState) -> str:
+            async with semaphore:
+                return await cosmos.save_complaint(state)
+
+        saved = await asyncio.gather(
+            *(save(state) for state in results),
+            return_exceptions=True,
+        )
+        for outcome in saved:
+            if isinstance(outcome, Exception):
+                logger.error("Failed to save complaint to Cosmos: %s", outcome)
+
+        logger.info(
+            "Batch processing completed: %d complaints processed and saved", len(results)
+        )
 
     except Exception as e:
-        logger.error(f"Batch processing failed: {e}")
+        logger.error("Batch processing failed: %s", e)
 
 
 @router.post("/complaints/process-single")
@@ -250,7 +362,7 @@ async def process_single_complaint(complaint: ComplaintRaw):
         }
 
     except Exception as e:
-        logger.error(f"Failed to process complaint: {e}")
+        logger.error("Failed to process complaint: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Processing failed: {str(e)}"
@@ -282,14 +394,14 @@ async def reprocess_complaint(complaint_id: str):
     try:
         result = await orchestrator.process_complaint(state.complaint_raw)
 
-        # Salva resultado atualizado
-        await cosmos.save_complaint(result)
-
-        # Log de auditoria
-        await cosmos.log_event(
-            complaint_id=complaint_id,
-            event_type="reprocessed",
-            details={"new_status": result.workflow_status.value}
+        # Salva resultado atualizado e registra auditoria em paralelo
+        await asyncio.gather(
+            cosmos.save_complaint(result),
+            cosmos.log_event(
+                complaint_id=complaint_id,
+                event_type="reprocessed",
+                details={"new_status": result.workflow_status.value}
+            ),
         )
 
         return {
@@ -311,22 +423,12 @@ async def get_complaints_summary():
     cosmos = await _ensure_cosmos_initialized()
 
     try:
-        stats = await cosmos.get_stats()
-
-        # Busca estatísticas adicionais (por categoria e time)
-        complaints = await cosmos.list_complaints(limit=1000)
-
-        by_category: Dict[str, int] = {}
-        by_team: Dict[str, int] = {}
-
-        for c in complaints:
-            if c.complaint_analyzed:
-                category = c.complaint_analyzed.category.value
-                by_category[category] = by_category.get(category, 0) + 1
-
-            if c.routing_decision:
-                team = c.routing_decision.team
-                by_team[team] = by_team.get(team, 0) + 1
+        # Estatísticas gerais e contagens por categoria e time em paralelo
+        stats, by_category, by_team = await asyncio.gather(
+            cosmos.get_stats(),
+            cosmos.count_by_field("category"),
+            cosmos.count_by_field("team"),
+        )
 
         return StatsResponse(
             total=stats.get("total", 0),
@@ -337,7 +439,7 @@ async def get_complaints_summary():
         )
 
     except Exception as e:
-        logger.error(f"Failed to get stats: {e}")
+        logger.error("Failed to get stats: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -369,5 +471,5 @@ async def get_complaint_audit_log(
         }
 
     except Exception as e:
-        logger.error(f"Failed to get audit log: {e}")
+        logger.error("Failed to get audit log: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -2,7 +2,7 @@
 Health check endpoints.
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 
 from fastapi import APIRouter
 
@@ -14,7 +14,7 @@ async def health_check():
     """Verifica a saúde da API."""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
         "service": "reclamaai-api",
     }
 
@@ -25,7 +25,7 @@ async def readiness_check():
     # TODO: Adicionar checks de dependências (DB, Azure, etc.)
     return {
         "status": "ready",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
         "checks": {
             "database": "ok",
             "azure_openai": "ok",
@@ -4,25 +4,41 @@ Carrega variáveis de ambiente e define configurações do sistema.
 """
 
 from functools import lru_cache
-from typing import Literal
+from typing import List, Literal
 
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     """Configurações da aplicação carregadas do ambiente."""
 
+    # Imutável: a instância é compartilhada via get_settings(). Os defaults
+    # abaixo já têm o tipo certo, então não são revalidados a cada carga.
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        frozen=True,
+        validate_default=False,
+    )
+
     # Application
     environment: Literal["development", "staging", "production"] = "development"
     log_level: str = "INFO"
     api_host: str = "0.0.0.0"
     api_port: int = 8000
+    batch_workers: int = 2
+    batch_queue_size: int = 256
+    allowed_origins: List[str] = ["*"]
 
     # Azure OpenAI
     azure_openai_endpoint: str
     azure_openai_api_key: str
     azure_openai_api_version: str = "2024-02-15-preview"
     azure_openai_deployment_name: str = "gpt-4o-mini"
+    azure_openai_max_concurrency: int = 8
+    # Modo JSON (response_format=json_object); desligue em deployments sem suporte
+    azure_openai_json_mode: bool = True
 
     # Azure AI Search
     azure_search_endpoint: str
@@ -34,6 +50,8 @@ class Settings(BaseSettings):
     cosmos_key: str
     cosmos_database_name: str = "reclamaai"
     cosmos_container_name: str = "complaints"
+    cosmos_preferred_locations: List[str] = []
+    cosmos_save_concurrency: int = 16
 
     # LangSmith
     langchain_tracing_v2: bool = True
@@ -49,11 +67,6 @@ class Settings(BaseSettings):
     use_mock_email: bool = True
     mock_data_path: str = "./data/mock"
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
-
 
 @lru_cache
 def get_settings() -> Settings:
@@ -4,13 +4,31 @@ Grafo exportado para integração com LangGraph Studio.
 """
 
 import asyncio
+import atexit
+import functools
 import logging
-from datetime import datetime
+import threading
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 from typing_extensions import TypedDict, Annotated
 
 from langgraph.graph import StateGraph, START, END
 
+from src.agents import (
+    get_analyst_agent,
+    get_communicator_agent,
+    get_privacy_agent,
+    get_router_agent,
+)
+from src.models.schemas import (
+    ComplaintAnalyzed,
+    ComplaintRaw,
+    ComplaintState,
+    RoutingDecision,
+    TeamInfo,
+    WorkflowStatus,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,6 +50,7 @@ class ComplaintGraphState(TypedDict, total=False):
     complaint_anonymized: Optional[Dict[str, Any]]
     complaint_analyzed: Optional[Dict[str, Any]]
     routing_decision: Optional[Dict[str, Any]]
+    team_candidates: Optional[List[Dict[str, Any]]]
     ticket_info: Optional[Dict[str, Any]]
     notification_info: Optional[Dict[str, Any]]
 
@@ -49,36 +68,184 @@ class ComplaintGraphState(TypedDict, total=False):
 # Helper Functions
 # ==============================================================================
 
+# Campos opcionais do state que valem None quando ausentes
+_OPTIONAL_STATE_KEYS = (
+    "complaint_anonymized",
+    "complaint_analyzed",
+    "routing_decision",
+    "team_candidates",
+    "ticket_info",
+    "notification_info",
+    "completed_at",
+)
+
+# complaint_raw vazio (somente leitura) para quando o state ainda não o tem
+_EMPTY_RAW: Dict[str, Any] = {}
+
+# Campos preenchidos por ensure_defaults que o nó de entrada grava no state
+# (os nós retornam só as chaves que mudaram)
+_ENTRY_KEYS = ("complaint_id", "source", "started_at", "errors")
+
+
 def get_complaint_id(state: dict) -> str:
     """Extrai complaint_id do state de forma segura."""
     # Tenta do nível raiz
     if "complaint_id" in state:
         return state["complaint_id"]
-    # Tenta do complaint_raw
-    raw = state.get("complaint_raw", {})
-    if isinstance(raw, dict):
-        return raw.get("id") or raw.get("external_id") or "unknown"
-    return "unknown"
+    # Tenta do complaint_raw (sempre um dict, conforme ComplaintGraphState)
+    raw = state.get("complaint_raw") or _EMPTY_RAW
+    return raw.get("id") or raw.get("external_id") or "unknown"
+
+
+def entry_update(state: dict) -> Dict[str, Any]:
+    """
+    Chaves de identificação que o nó de entrada precisa gravar no state.
+
+    Args:
+        state: State já passado por ensure_defaults
+
+    Returns:
+        Dict parcial com complaint_id, source, started_at e errors
+    """
+    return {key: state[key] for key in _ENTRY_KEYS}
+
+
+def parse_raw(raw_data: Dict[str, Any]) -> ComplaintRaw:
+    """
+    Valida o complaint_raw de entrada (uma vez, no nó de entrada do grafo).
+
+    Sem cache: o payload ainda não foi anonimizado e não deve ficar em
+    memória além da execução, e cada execução recebe sua própria instância.
+
+    Args:
+        raw_data: Dict do complaint_raw
+
+    Returns:
+        ComplaintRaw validado
+    """
+    return ComplaintRaw.model_validate(raw_data)
+
+
+def load_model(model_cls, data: Dict[str, Any]):
+    """
+    Reconstrói um modelo a partir de um dict gravado no state por um nó.
+
+    Valida (em vez de model_construct) porque o state é JSON: enums e
+    datetimes precisam voltar aos tipos nativos que os agentes usam.
+
+    Args:
+        model_cls: Classe Pydantic do modelo
+        data: Dict produzido por dump_model
+
+    Returns:
+        Instância do modelo
+    """
+    return model_cls.model_validate(data)
+
+
+def dump_model(model) -> Optional[Dict[str, Any]]:
+    """
+    Serializa um modelo opcional para o state do grafo.
+
+    Usa mode="json": o state sai do nó e precisa continuar serializável
+    (checkpointers, LangGraph Studio).
+
+    Args:
+        model: Instância Pydantic ou None
+
+    Returns:
+        Dict do modelo ou None
+    """
+    return model.model_dump(mode="json") if model is not None else None
 
 
 def ensure_defaults(state: dict) -> dict:
-    """Garante que o state tem todos os campos necessários com defaults."""
-    defaults = {
-        "complaint_id": get_complaint_id(state),
-        "source": state.get("source") or state.get("complaint_raw", {}).get("source", "UNKNOWN"),
-        "complaint_raw": state.get("complaint_raw", {}),
-        "complaint_anonymized": state.get("complaint_anonymized"),
-        "complaint_analyzed": state.get("complaint_analyzed"),
-        "routing_decision": state.get("routing_decision"),
-        "ticket_info": state.get("ticket_info"),
-        "notification_info": state.get("notification_info"),
-        "current_step": state.get("current_step", "new"),
-        "workflow_status": state.get("workflow_status", "NEW"),
-        "errors": state.get("errors", []),
-        "started_at": state.get("started_at", datetime.utcnow().isoformat()),
-        "completed_at": state.get("completed_at"),
-    }
-    return defaults
+    """
+    Garante que o state tem todos os campos necessários com defaults.
+
+    Preenche no próprio dict só o que falta (chamado a cada transição do
+    grafo, evita montar um dict novo) e o retorna.
+    """
+    raw = state.get("complaint_raw") or _EMPTY_RAW
+
+    if "complaint_id" not in state:
+        state["complaint_id"] = raw.get("id") or raw.get("external_id") or "unknown"
+    if not state.get("source"):
+        state["source"] = raw.get("source", "UNKNOWN")
+    if "started_at" not in state:
+        state["started_at"] = datetime.now(timezone.utc).isoformat()
+
+    state.setdefault("complaint_raw", {})
+    state.setdefault("current_step", "new")
+    state.setdefault("workflow_status", "NEW")
+    state.setdefault("errors", [])
+    for key in _OPTIONAL_STATE_KEYS:
+        state.setdefault(key, None)
+
+    return state
+
+
+@functools.cache
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Event loop persistente, rodando numa thread daemon (criado no primeiro uso).
+
+    Os nós são síncronos, mas os agentes são async: em vez de criar um loop
+    (e um ThreadPoolExecutor) a cada nó, todas as corrotinas rodam neste loop,
+    o que também mantém os clients async dos agentes no mesmo loop.
+
+    Returns:
+        Loop em execução
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(
+        target=loop.run_forever,
+        name="complaint-graph-loop",
+        daemon=True,
+    ).start()
+    # Para o loop no encerramento do processo
+    atexit.register(loop.call_soon_threadsafe, loop.stop)
+    return loop
+
+
+def run_sync(coro):
+    """
+    Executa uma corrotina no loop persistente e espera o resultado.
+
+    Funciona com ou sem um event loop rodando na thread chamadora.
+
+    Args:
+        coro: Corrotina a executar
+
+    Returns:
+        Resultado da corrotina
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+
+async def _bootstrap_agents(use_azure_search: bool) -> None:
+    """Inicializa os quatro agentes do grafo em paralelo."""
+    await asyncio.gather(
+        get_privacy_agent().ensure_initialized(),
+        get_analyst_agent().ensure_initialized(),
+        get_router_agent(use_azure_search=use_azure_search).ensure_initialized(),
+        get_communicator_agent().ensure_initialized(),
+    )
+
+
+@functools.cache
+def ensure_agents_ready(use_azure_search: bool = False) -> None:
+    """
+    Inicializa os agentes uma única vez por processo, no primeiro nó executado.
+
+    Não roda na construção do grafo porque o módulo é importado (e o grafo
+    compilado) sem depender das configurações do Azure. Se falhar, nada fica
+    em cache e o próximo nó tenta de novo.
+
+    Args:
+        use_azure_search: Se o router usado pelo grafo tem RAG habilitado
+    """
+    run_sync(_bootstrap_agents(use_azure_search))
 
 
 # ==============================================================================
@@ -96,15 +263,12 @@ def anonymize_node(state: dict) -> dict:
     logger.info(f"[ANONYMIZE] Processing complaint {complaint_id}")
 
     try:
-        from src.agents import get_privacy_agent
-        from src.models.schemas import ComplaintRaw, ComplaintState, WorkflowStatus
-
         # Reconstrói o ComplaintRaw a partir do dict
         raw_data = state["complaint_raw"]
         if not raw_data:
             raise ValueError("complaint_raw is required")
 
-        complaint_raw = ComplaintRaw(**raw_data)
+        complaint_raw = parse_raw(raw_data)
 
         # Cria estado para o agente
         agent_state = ComplaintState(
@@ -113,32 +277,23 @@ def anonymize_node(state: dict) -> dict:
             errors=[],
         )
 
+        ensure_agents_ready()
+
         # Executa o agente
         privacy_agent = get_privacy_agent()
 
         async def run_privacy():
-            await privacy_agent.initialize()
             return await privacy_agent.process_state(agent_state)
 
-        # Executa async
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    result = pool.submit(asyncio.run, run_privacy()).result()
-            else:
-                result = loop.run_until_complete(run_privacy())
-        except RuntimeError:
-            result = asyncio.run(run_privacy())
+        # Executa async no loop persistente
+        result = run_sync(run_privacy())
 
         # Atualiza estado do grafo
         return {
-            **state,
-            "complaint_anonymized": (
-                result.complaint_anonymized.model_dump(mode="json")
-                if result.complaint_anonymized else None
-            ),
+            **entry_update(state),
+            # Entrada externa normalizada (source, datas) para os próximos nós
+            "complaint_raw": dump_model(complaint_raw),
+            "complaint_anonymized": dump_model(result.complaint_anonymized),
             "current_step": "anonymized",
             "workflow_status": "ANONYMIZED",
         }
@@ -148,7 +303,7 @@ def anonymize_node(state: dict) -> dict:
         errors = state.get("errors", [])
         errors.append(f"Anonymization error: {str(e)}")
         return {
-            **state,
+            **entry_update(state),
             "errors": errors,
             "workflow_status": "FAILED_ANONYMIZATION",
         }
@@ -166,18 +321,16 @@ def analyze_node(state: dict) -> dict:
     # Skip se houve erro anterior
     if state.get("workflow_status", "").startswith("FAILED"):
         logger.warning(f"[ANALYZE] Skipping due to previous error")
-        return state
+        return {}
 
     try:
-        from src.agents import get_analyst_agent
-        from src.models.schemas import ComplaintRaw, ComplaintState, WorkflowStatus
-
         # Reconstrói os objetos
-        raw_data = state["complaint_raw"]
-        complaint_raw = ComplaintRaw(**raw_data)
+        complaint_raw = load_model(ComplaintRaw, state["complaint_raw"])
 
         anonymized_data = state.get("complaint_anonymized")
-        complaint_anonymized = ComplaintRaw(**anonymized_data) if anonymized_data else None
+        complaint_anonymized = (
+            load_model(ComplaintRaw, anonymized_data) if anonymized_data else None
+        )
 
         # Cria estado para o agente
         agent_state = ComplaintState(
@@ -187,36 +340,27 @@ def analyze_node(state: dict) -> dict:
             errors=[],
         )
 
+        ensure_agents_ready()
+
         # Executa o agente
         analyst_agent = get_analyst_agent()
 
         async def run_analyst():
-            await analyst_agent.initialize()
             return await analyst_agent.execute(agent_state)
 
-        # Executa async
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    result = pool.submit(asyncio.run, run_analyst()).result()
-            else:
-                result = loop.run_until_complete(run_analyst())
-        except RuntimeError:
-            result = asyncio.run(run_analyst())
+        # Executa async no loop persistente
+        result = run_sync(run_analyst())
 
         # Atualiza estado do grafo
         analyzed_dict = None
         if result.complaint_analyzed:
-            analyzed_dict = result.complaint_analyzed.model_dump(mode="json")
+            analyzed_dict = dump_model(result.complaint_analyzed)
             logger.info(
                 f"[ANALYZE] Completed: category={result.complaint_analyzed.category.value}, "
                 f"urgency={result.complaint_analyzed.urgency.value}"
             )
 
         return {
-            **state,
             "complaint_analyzed": analyzed_dict,
             "current_step": "analyzed",
             "workflow_status": result.workflow_status.value,
@@ -227,13 +371,45 @@ def analyze_node(state: dict) -> dict:
         errors = state.get("errors", [])
         errors.append(f"Analysis error: {str(e)}")
         return {
-            **state,
             "errors": errors,
             "workflow_status": "FAILED_LLM",
         }
 
 
-def route_node(state: dict) -> dict:
+def route_prefetch_node(state: dict, use_azure_search: bool = True) -> dict:
+    """
+    Nó de pré-busca - consulta o RAG por times candidatos em paralelo à análise.
+
+    Usa só o texto anonimizado; o route_node escolhe entre os candidatos o
+    que atende a categoria classificada.
+    """
+    state = ensure_defaults(state)
+    complaint_id = state["complaint_id"]
+
+    logger.info("[ROUTE_PREFETCH] Processing complaint %s", complaint_id)
+
+    # Skip se houve erro anterior
+    if state.get("workflow_status", "").startswith("FAILED"):
+        return {}
+
+    try:
+        complaint_data = state.get("complaint_anonymized") or state["complaint_raw"]
+        complaint = load_model(ComplaintRaw, complaint_data)
+
+        ensure_agents_ready(use_azure_search)
+
+        router_agent = get_router_agent(use_azure_search=use_azure_search)
+        teams = run_sync(router_agent.prefetch_teams(complaint))
+
+        return {"team_candidates": [dump_model(team) for team in teams]}
+
+    except Exception as e:
+        # Pré-busca é opcional: o route_node ainda tem RAG e mapeamento local
+        logger.warning("[ROUTE_PREFETCH] Error: %s", e)
+        return {}
+
+
+def route_node(state: dict, use_azure_search: bool = False) -> dict:
     """
     Nó de roteamento - determina qual equipe deve tratar a reclamação.
     """
@@ -245,22 +421,21 @@ def route_node(state: dict) -> dict:
     # Skip se houve erro anterior
     if state.get("workflow_status", "").startswith("FAILED"):
         logger.warning(f"[ROUTE] Skipping due to previous error")
-        return state
+        return {}
 
     try:
-        from src.agents import get_router_agent
-        from src.models.schemas import (
-            ComplaintRaw, ComplaintAnalyzed, ComplaintState, WorkflowStatus
-        )
-
         # Reconstrói os objetos
-        complaint_raw = ComplaintRaw(**state["complaint_raw"])
+        complaint_raw = load_model(ComplaintRaw, state["complaint_raw"])
 
         analyzed_data = state.get("complaint_analyzed")
         if not analyzed_data:
             raise ValueError("No analysis data available for routing")
 
-        complaint_analyzed = ComplaintAnalyzed(**analyzed_data)
+        complaint_analyzed = load_model(ComplaintAnalyzed, analyzed_data)
+
+        team_candidates = [
+            load_model(TeamInfo, team) for team in state.get("team_candidates") or ()
+        ]
 
         # Cria estado para o agente
         agent_state = ComplaintState(
@@ -268,38 +443,30 @@ def route_node(state: dict) -> dict:
             complaint_analyzed=complaint_analyzed,
             workflow_status=WorkflowStatus.ANALYZED,
             errors=[],
+            team_candidates=team_candidates,
         )
 
+        ensure_agents_ready(use_azure_search)
+
         # Executa o agente (sem Azure Search por padrão no Studio)
-        router_agent = get_router_agent(use_azure_search=False)
+        router_agent = get_router_agent(use_azure_search=use_azure_search)
 
         async def run_router():
-            await router_agent.initialize()
             return await router_agent.execute(agent_state)
 
-        # Executa async
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    result = pool.submit(asyncio.run, run_router()).result()
-            else:
-                result = loop.run_until_complete(run_router())
-        except RuntimeError:
-            result = asyncio.run(run_router())
+        # Executa async no loop persistente
+        result = run_sync(run_router())
 
         # Atualiza estado do grafo
         routing_dict = None
         if result.routing_decision:
-            routing_dict = result.routing_decision.model_dump(mode="json")
+            routing_dict = dump_model(result.routing_decision)
             logger.info(
                 f"[ROUTE] Completed: team={result.routing_decision.team}, "
                 f"priority={result.routing_decision.priority}"
             )
 
         return {
-            **state,
             "routing_decision": routing_dict,
             "current_step": "routed",
             "workflow_status": result.workflow_status.value,
@@ -310,7 +477,6 @@ def route_node(state: dict) -> dict:
         errors = state.get("errors", [])
         errors.append(f"Routing error: {str(e)}")
         return {
-            **state,
             "errors": errors,
             "workflow_status": "FAILED_ROUTING",
         }
@@ -328,26 +494,22 @@ def communicate_node(state: dict) -> dict:
     # Skip se houve erro anterior
     if state.get("workflow_status", "").startswith("FAILED"):
         logger.warning(f"[COMMUNICATE] Skipping due to previous error")
-        return state
+        return {}
 
     try:
-        from src.agents import get_communicator_agent
-        from src.models.schemas import (
-            ComplaintRaw, ComplaintAnalyzed, RoutingDecision,
-            ComplaintState, WorkflowStatus
-        )
-
         # Reconstrói os objetos
-        complaint_raw = ComplaintRaw(**state["complaint_raw"])
+        complaint_raw = load_model(ComplaintRaw, state["complaint_raw"])
 
         analyzed_data = state.get("complaint_analyzed")
-        complaint_analyzed = ComplaintAnalyzed(**analyzed_data) if analyzed_data else None
+        complaint_analyzed = (
+            load_model(ComplaintAnalyzed, analyzed_data) if analyzed_data else None
+        )
 
         routing_data = state.get("routing_decision")
         if not routing_data:
             raise ValueError("No routing decision available")
 
-        routing_decision = RoutingDecision(**routing_data)
+        routing_decision = load_model(RoutingDecision, routing_data)
 
         # Cria estado para o agente
         agent_state = ComplaintState(
@@ -358,43 +520,34 @@ def communicate_node(state: dict) -> dict:
             errors=[],
         )
 
+        ensure_agents_ready()
+
         # Executa o agente
         communicator_agent = get_communicator_agent()
 
         async def run_communicator():
-            await communicator_agent.initialize()
             return await communicator_agent.execute(agent_state)
 
-        # Executa async
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    result = pool.submit(asyncio.run, run_communicator()).result()
-            else:
-                result = loop.run_until_complete(run_communicator())
-        except RuntimeError:
-            result = asyncio.run(run_communicator())
+        # Executa async no loop persistente
+        result = run_sync(run_communicator())
 
         # Atualiza estado do grafo
         ticket_dict = None
         notification_dict = None
 
         if result.ticket_info:
-            ticket_dict = result.ticket_info.model_dump(mode="json")
-            logger.info(f"[COMMUNICATE] Ticket created: {result.ticket_info.ticket_key}")
+            ticket_dict = dump_model(result.ticket_info)
+            logger.info(f"[COMMUNICATE] Ticket created: {result.ticket_info.jira_key}")
 
         if result.notification_info:
-            notification_dict = result.notification_info.model_dump(mode="json")
+            notification_dict = dump_model(result.notification_info)
 
         return {
-            **state,
             "ticket_info": ticket_dict,
             "notification_info": notification_dict,
             "current_step": "completed",
             "workflow_status": result.workflow_status.value,
-            "completed_at": datetime.utcnow().isoformat(),
+            "completed_at": datetime.now(timezone.utc).isoformat(),
         }
 
     except Exception as e:
@@ -402,36 +555,141 @@ def communicate_node(state: dict) -> dict:
         errors = state.get("errors", [])
         errors.append(f"Communication error: {str(e)}")
         return {
-            **state,
             "errors": errors,
             "workflow_status": "FAILED_JIRA",
         }
 
 
+def pipeline_node(state: dict) -> dict:
+    """
+    Nó único (fundido) - anonimiza, analisa, roteia e comunica em uma só corrotina.
+
+    Mantém o ComplaintState vivo entre os agentes: o payload é validado uma
+    vez na entrada e serializado uma vez na saída, em vez de ser
+    reconstruído e despejado em cada um dos quatro nós.
+    """
+    state = ensure_defaults(state)
+    complaint_id = state["complaint_id"]
+
+    logger.info("[PIPELINE] Processing complaint %s", complaint_id)
+
+    try:
+        raw_data = state["complaint_raw"]
+        if not raw_data:
+            raise ValueError("complaint_raw is required")
+
+        agent_state = ComplaintState(
+            complaint_raw=parse_raw(raw_data),
+            workflow_status=WorkflowStatus.NEW,
+            errors=[],
+        )
+
+        ensure_agents_ready()
+    except Exception as e:
+        logger.error("[PIPELINE] Error: %s", e, exc_info=True)
+        state["errors"].append(f"Anonymization error: {str(e)}")
+        return {
+            **entry_update(state),
+            "workflow_status": "FAILED_ANONYMIZATION",
+        }
+
+    privacy_agent = get_privacy_agent()
+    stages = (
+        get_analyst_agent(),
+        get_router_agent(use_azure_search=False),
+        get_communicator_agent(),
+    )
+
+    async def run_pipeline():
+        try:
+            await privacy_agent.process_state(agent_state)
+        except Exception as e:
+            logger.error("[PIPELINE] Anonymization error: %s", e, exc_info=True)
+            agent_state.errors.append(f"Anonymization error: {str(e)}")
+            return "FAILED_ANONYMIZATION"
+
+        # Cada agente grava o status de falha no próprio state; para no primeiro
+        for agent in stages:
+            await agent.execute(agent_state)
+            if agent_state.workflow_status.value.startswith("FAILED"):
+                break
+        return agent_state.workflow_status.value
+
+    # Executa async no loop persistente
+    workflow_status = run_sync(run_pipeline())
+    completed = not workflow_status.startswith("FAILED")
+
+    # Serialização única do resultado
+    return {
+        **entry_update(state),
+        "complaint_anonymized": dump_model(agent_state.complaint_anonymized),
+        "complaint_analyzed": dump_model(agent_state.complaint_analyzed),
+        "routing_decision": dump_model(agent_state.routing_decision),
+        "ticket_info": dump_model(agent_state.ticket_info),
+        "notification_info": dump_model(agent_state.notification_info),
+        "errors": state["errors"] + agent_state.errors,
+        "current_step": "completed" if completed else state["current_step"],
+        "workflow_status": workflow_status,
+        "completed_at": datetime.now(timezone.utc).isoformat() if completed else None,
+    }
+
+
 # ==============================================================================
 # Graph Definition
 # ==============================================================================
 
-def create_complaint_graph() -> StateGraph:
+def create_complaint_graph(
+    fused: bool = False,
+    use_azure_search: bool = False,
+) -> StateGraph:
     """
     Cria o grafo de processamento de reclamações.
 
     Workflow:
     START -> anonymize -> analyze -> route -> communicate -> END
+
+    Com Azure Search, a busca de times candidatos roda em paralelo à análise:
+    anonymize -> [analyze, route_prefetch] -> route -> communicate
+
+    Args:
+        fused: Se True, usa um único nó (pipeline_node) com as quatro etapas,
+            sem re-hidratar os modelos entre elas. O padrão mantém os quatro
+            nós para visualização passo a passo no LangGraph Studio.
+        use_azure_search: Se True, roteia com RAG (Azure AI Search) e
+            adiciona o nó route_prefetch. Ignorado quando fused=True.
+
+    Returns:
+        Grafo (não compilado)
     """
     # Cria o grafo com o tipo de estado
     workflow = StateGraph(ComplaintGraphState)
 
+    if fused:
+        workflow.add_node("pipeline", pipeline_node)
+        workflow.add_edge(START, "pipeline")
+        workflow.add_edge("pipeline", END)
+        return workflow
+
     # Adiciona nós
     workflow.add_node("anonymize", anonymize_node)
     workflow.add_node("analyze", analyze_node)
-    workflow.add_node("route", route_node)
+    workflow.add_node(
+        "route", functools.partial(route_node, use_azure_search=use_azure_search)
+    )
     workflow.add_node("communicate", communicate_node)
 
-    # Define o fluxo linear
     workflow.add_edge(START, "anonymize")
     workflow.add_edge("anonymize", "analyze")
-    workflow.add_edge("analyze", "route")
+
+    if use_azure_search:
+        # Fan-out: pré-busca no RAG em paralelo à análise; route espera os dois
+        workflow.add_node("route_prefetch", route_prefetch_node)
+        workflow.add_edge("anonymize", "route_prefetch")
+        workflow.add_edge(["analyze", "route_prefetch"], "route")
+    else:
+        # Define o fluxo linear
+        workflow.add_edge("analyze", "route")
+
     workflow.add_edge("route", "communicate")
     workflow.add_edge("communicate", END)
 
@@ -445,6 +703,9 @@ def create_complaint_graph() -> StateGraph:
 # Compila o grafo - DEVE ser exportado como 'graph'
 graph = create_complaint_graph().compile()
 
+# Versão fundida (um nó só) para execução fora do Studio
+fused_graph = create_complaint_graph(fused=True).compile()
+
 
 # ==============================================================================
 # Example Input for LangGraph Studio
@@ -4,11 +4,13 @@ Gerencia conexão e chamadas ao LLM para análise de reclamações.
 Inclui integração com LangSmith para tracing.
 """
 
-import json
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional
 
+import orjson
 from langchain_openai import AzureChatOpenAI
+from openai import AsyncAzureOpenAI
 from langchain.schema import HumanMessage, SystemMessage
 from langchain.callbacks.base import BaseCallbackHandler
 
@@ -41,6 +43,7 @@ class AzureOpenAIClient:
 
         self.settings = get_settings()
         self.llm = self._create_llm()
+        self._raw = self._create_raw_client()
         self._initialized = True
         logger.info("Azure OpenAI client initialized")
 
@@ -58,8 +61,79 @@ class AzureOpenAIClient:
             azure_deployment=self.settings.azure_openai_deployment_name,
             temperature=0.1,
             max_tokens=1000,
+            model_kwargs=self._response_format(),
         )
 
+    def _response_format(self) -> Dict[str, Any]:
+        """
+        Parâmetros de formato de resposta conforme azure_openai_json_mode.
+
+        Returns:
+            {"response_format": {"type": "json_object"}} ou dict vazio
+        """
+        if self.settings.azure_openai_json_mode:
+            return {"response_format": {"type": "json_object"}}
+        return {}
+
+    def _create_raw_client(self) -> AsyncAzureOpenAI:
+        """
+        Cria o cliente OpenAI direto (sem LangChain) para chamadas sem tracing.
+
+        Returns:
+            AsyncAzureOpenAI configurado
+        """
+        return AsyncAzureOpenAI(
+            azure_endpoint=self.settings.azure_openai_endpoint,
+            api_key=self.settings.azure_openai_api_key,
+            api_version=self.settings.azure_openai_api_version,
+        )
+
+    async def analyze_fast(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.1,
+        max_tokens: int = 1000,
+    ) -> Dict[str, Any]:
+        """
+        Executa análise chamando o Azure OpenAI direto.
+
+        Evita o overhead do LangChain (mensagens, callbacks, config) quando
+        não há tracing a registrar. Em modo JSON os prompts precisam
+        mencionar "JSON".
+
+        Args:
+            system_prompt: Prompt do sistema
+            user_prompt: Prompt do usuário
+            temperature: Temperatura (0-1)
+            max_tokens: Máximo de tokens na resposta
+
+        Returns:
+            Dict parseado do JSON de resposta
+
+        Raises:
+            LLMError: Se falhar na chamada ou parse
+        """
+        try:
+            response = await self._raw.chat.completions.create(
+                model=self.settings.azure_openai_deployment_name,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **self._response_format(),
+            )
+            return self._parse_json_response(response.choices[0].message.content)
+
+        except orjson.JSONDecodeError as e:
+            logger.error("Failed to parse LLM response as JSON: %s", e)
+            raise LLMError(f"Invalid JSON response from LLM: {e}")
+        except Exception as e:
+            logger.error("LLM call failed: %s", e)
+            raise LLMError(f"LLM call failed: {e}")
+
     async def analyze(
         self,
         system_prompt: str,
@@ -73,6 +147,9 @@ class AzureOpenAIClient:
         """
         Executa análise com o LLM.
 
+        Sem run_name/metadata/tags não há tracing a registrar, e a chamada
+        segue pelo caminho direto (analyze_fast).
+
         Args:
             system_prompt: Prompt do sistema
             user_prompt: Prompt do usuário
@@ -88,16 +165,22 @@ class AzureOpenAIClient:
         Raises:
             LLMError: Se falhar na chamada ou parse
         """
+        if run_name is None and metadata is None and tags is None:
+            return await self.analyze_fast(
+                system_prompt, user_prompt, temperature, max_tokens
+            )
+
         try:
             messages = [
                 SystemMessage(content=system_prompt),
                 HumanMessage(content=user_prompt),
             ]
 
-            # Atualiza configurações se diferentes do padrão
+            # Parâmetros por chamada: o self.llm é compartilhado entre
+            # chamadas concorrentes e não deve ser alterado
+            llm = self.llm
             if temperature != 0.1 or max_tokens != 1000:
-                self.llm.temperature = temperature
-                self.llm.max_tokens = max_tokens
+                llm = llm.bind(temperature=temperature, max_tokens=max_tokens)
 
             # Prepara config para LangSmith tracing
             invoke_config = {}
@@ -120,9 +203,9 @@ class AzureOpenAIClient:
 
             # Chama o LLM com config de tracing
             if invoke_config:
-                response = await self.llm.ainvoke(messages, config=invoke_config)
+                response = await llm.ainvoke(messages, config=invoke_config)
             else:
-                response = await self.llm.ainvoke(messages)
+                response = await llm.ainvoke(messages)
 
             content = response.content
 
@@ -131,7 +214,7 @@ class AzureOpenAIClient:
             logger.debug(f"LLM response parsed successfully: {result}")
             return result
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse LLM response as JSON: {e}")
             raise LLMError(f"Invalid JSON response from LLM: {e}")
         except Exception as e:
@@ -140,7 +223,10 @@ class AzureOpenAIClient:
 
     def _parse_json_response(self, content: str) -> Dict[str, Any]:
         """
-        Extrai e parseia JSON da resposta do LLM.
+        Parseia o JSON da resposta do LLM.
+
+        Em modo JSON a resposta já é JSON puro. Sem ele (deployments legados),
+        remove blocos markdown e procura o objeto JSON no texto.
 
         Args:
             content: Conteúdo da resposta
@@ -149,8 +235,11 @@ class AzureOpenAIClient:
             Dict parseado
 
         Raises:
-            json.JSONDecodeError: Se não conseguir parsear
+            orjson.JSONDecodeError: Se não conseguir parsear
         """
+        if self.settings.azure_openai_json_mode:
+            return orjson.loads(content)
+
         # Tenta encontrar JSON na resposta
         content = content.strip()
 
@@ -171,42 +260,118 @@ class AzureOpenAIClient:
 
         if start_idx != -1 and end_idx > start_idx:
             json_str = content[start_idx:end_idx]
-            return json.loads(json_str)
+            return orjson.loads(json_str)
 
         # Se não encontrou, tenta parsear diretamente
-        return json.loads(content)
+        return orjson.loads(content)
 
     async def analyze_batch(
         self,
         system_prompt: str,
         user_prompts: List[str],
         temperature: float = 0.1,
-        max_tokens: int = 1000
+        max_tokens: int = 1000,
+        max_concurrency: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
-        Executa análise em lote.
+        Executa análise em lote, com chamadas concorrentes ao LLM.
 
         Args:
             system_prompt: Prompt do sistema
             user_prompts: Lista de prompts do usuário
             temperature: Temperatura
             max_tokens: Máximo de tokens
+            max_concurrency: Máximo de chamadas simultâneas
+                (padrão: azure_openai_max_concurrency)
 
         Returns:
-            Lista de resultados
+            Lista de resultados, na ordem dos prompts
         """
-        results = []
-        for prompt in user_prompts:
-            try:
-                result = await self.analyze(
+        semaphore = asyncio.Semaphore(
+            max_concurrency or self.settings.azure_openai_max_concurrency
+        )
+
+        async def analyze_one(prompt: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.analyze(
                     system_prompt, prompt, temperature, max_tokens
                 )
-                results.append(result)
-            except LLMError as e:
-                logger.warning(f"Batch item failed: {e}")
-                results.append({"error": str(e)})
+
+        outcomes = await asyncio.gather(
+            *(analyze_one(prompt) for prompt in user_prompts),
+            return_exceptions=True,
+        )
+
+        results = []
+        for outcome in outcomes:
+            if isinstance(outcome, LLMError):
+                logger.warning("Batch item failed: %s", outcome)
+                results.append({"error": str(outcome)})
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                results.append(outcome)
         return results
 
+    async def analyze_marshaled(
+        self,
+        system_prompt: str,
+        user_prompts: List[str],
+        temperature: float = 0.1,
+        max_tokens: int = 4000,
+    ) -> List[Dict[str, Any]]:
+        """
+        Executa análise em lote numa única chamada ao LLM.
+
+        Os prompts vão como um array JSON com IDs na mesma mensagem, sob o
+        mesmo system prompt, e o modelo responde {"results": [{"id": ...}]}.
+        Troca N chamadas por uma; use para lotes pequenos (a resposta inteira
+        precisa caber em max_tokens).
+
+        Args:
+            system_prompt: Prompt do sistema (aplicado a cada item)
+            user_prompts: Lista de prompts do usuário
+            temperature: Temperatura
+            max_tokens: Máximo de tokens da resposta do lote
+
+        Returns:
+            Lista de resultados, na ordem dos prompts ({"error": ...} para
+            itens ausentes na resposta)
+
+        Raises:
+            LLMError: Se falhar na chamada ou parse
+        """
+        if not user_prompts:
+            return []
+
+        batch_prompt = (
+            "Analise cada item do array JSON abaixo de forma independente, "
+            "seguindo as instruções do sistema. Responda APENAS com um JSON no "
+            'formato {"results": [{"id": <id do item>, ...resultado...}]}, '
+            "com um resultado por item.\n\n"
+            + orjson.dumps(
+                [{"id": i, "input": prompt} for i, prompt in enumerate(user_prompts)]
+            ).decode()
+        )
+
+        response = await self.analyze(
+            system_prompt, batch_prompt, temperature, max_tokens
+        )
+
+        results = response.get("results") if isinstance(response, dict) else None
+        if not isinstance(results, list):
+            raise LLMError("Batch response is not an object with a 'results' list")
+
+        by_id = {}
+        for item in results:
+            if isinstance(item, dict) and "id" in item:
+                by_id[str(item.pop("id"))] = item
+
+        return [
+            by_id.get(str(i), {"error": "Missing result in batch response"})
+            for i in range(len(user_prompts))
+        ]
+
     async def health_check(self) -> bool:
         """
         Verifica conectividade com Azure OpenAI.
@@ -215,7 +380,8 @@ class AzureOpenAIClient:
             True se conectado, False caso contrário
         """
         try:
-            messages = [HumanMessage(content="Olá")]
+            # O modo JSON exige "JSON" na mensagem
+            messages = [HumanMessage(content='Responda com o JSON {"ok": true}')]
             response = await self.llm.ainvoke(messages)
             return bool(response.content)
         except Exception as e:
@@ -3,6 +3,7 @@ Cliente para Azure AI Search (RAG).
 Gerencia busca semântica de times para roteamento.
 """
 
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional
 
@@ -100,19 +101,8 @@ class AzureSearchClient:
                 # Busca exata na lista de categorias
                 filter_str = f"categories/any(c: c eq '{category}')"
 
-            # Executa busca
-            results = self.client.search(
-                search_text=query,
-                filter=filter_str,
-                top=top_k,
-                include_total_count=True,
-            )
-
-            teams = []
-            for result in results:
-                team = self._result_to_team(result)
-                if team:
-                    teams.append(team)
+            # SDK síncrono (a paginação também faz I/O): roda fora do event loop
+            teams = await asyncio.to_thread(self._run_search, query, filter_str, top_k)
 
             logger.debug(f"Search found {len(teams)} teams for query: {query[:50]}...")
             return teams
@@ -121,6 +111,37 @@ class AzureSearchClient:
             logger.error(f"Search failed: {e}")
             raise SearchError(f"Search failed: {e}")
 
+    def _run_search(
+        self,
+        query: str,
+        filter_str: Optional[str],
+        top_k: int,
+    ) -> List[TeamInfo]:
+        """
+        Executa a busca e consome os resultados (bloqueante).
+
+        Args:
+            query: Texto para busca semântica
+            filter_str: Filtro OData ou None
+            top_k: Número de resultados
+
+        Returns:
+            Lista de TeamInfo
+        """
+        results = self.client.search(
+            search_text=query,
+            filter=filter_str,
+            top=top_k,
+            include_total_count=True,
+        )
+
+        teams = []
+        for result in results:
+            team = self._result_to_team(result)
+            if team:
+                teams.append(team)
+        return teams
+
     def _result_to_team(self, result: Dict[str, Any]) -> Optional[TeamInfo]:
         """
         Converte resultado de busca para TeamInfo.
@@ -3,10 +3,11 @@ Simulador de envio de emails.
 Simula notificações para desenvolvimento e testes.
 """
 
+import functools
 import logging
 import uuid
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, List, Optional
 
 from src.models.schemas import (
@@ -26,7 +27,7 @@ class EmailMessage:
     to: str
     subject: str
     body: str
-    sent_at: datetime = field(default_factory=datetime.utcnow)
+    sent_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     message_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     cc: Optional[List[str]] = None
     priority: str = "normal"
@@ -309,18 +310,12 @@ Este é um email automático do sistema ReclamaAI.
         }
 
 
-# Singleton instance
-_email_client: Optional[MockEmailClient] = None
-
-
+@functools.cache
 def get_email_client() -> MockEmailClient:
     """
     Factory function para obter cliente de email.
 
     Returns:
-        Instância do MockEmailClient
+        Instância singleton do MockEmailClient (criada uma única vez)
     """
-    global _email_client
-    if _email_client is None:
-        _email_client = MockEmailClient()
-    return _email_client
+    return MockEmailClient()
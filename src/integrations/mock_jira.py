@@ -3,8 +3,9 @@ Simulador de integração Jira.
 Simula criação de tickets para desenvolvimento e testes.
 """
 
+import functools
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, List, Optional
 
 from src.models.schemas import (
@@ -59,7 +60,7 @@ class MockJiraClient:
             jira_key=jira_key,
             jira_link=f"https://jira.technova.com/browse/{jira_key}",
             status="Open",
-            created_at=datetime.utcnow(),
+            created_at=datetime.now(timezone.utc),
         )
 
         # Armazena para consulta posterior
@@ -239,18 +240,12 @@ _Ticket gerado automaticamente pelo ReclamaAI_
         }
 
 
-# Singleton instance
-_jira_client: Optional[MockJiraClient] = None
-
-
+@functools.cache
 def get_jira_client() -> MockJiraClient:
     """
     Factory function para obter cliente Jira.
 
     Returns:
-        Instância do MockJiraClient
+        Instância singleton do MockJiraClient (criada uma única vez)
     """
-    global _jira_client
-    if _jira_client is None:
-        _jira_client = MockJiraClient()
-    return _jira_client
+    return MockJiraClient()
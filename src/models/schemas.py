@@ -3,13 +3,18 @@ Schemas e modelos de dados do ReclamaAI.
 Define as estruturas de dados usadas em todo o sistema.
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
 
+def utc_now() -> datetime:
+    """Data/hora atual em UTC (com timezone, comparável às demais do sistema)."""
+    return datetime.now(timezone.utc)
+
+
 class ComplaintSource(str, Enum):
     """Fontes de reclamações."""
     RECLAME_AQUI = "reclame_aqui"
@@ -104,7 +109,12 @@ class ComplaintAnalyzed(BaseModel):
     key_issues: List[str] = Field(default_factory=list, description="Pontos-chave identificados")
     qa_approved: bool = Field(default=False, description="Aprovado pelo QA Agent")
     qa_notes: Optional[str] = Field(default=None, description="Notas do QA")
-    analyzed_at: datetime = Field(default_factory=datetime.utcnow)
+    analyzed_at: datetime = Field(default_factory=utc_now)
+
+    @property
+    def category_lower(self) -> str:
+        """Categoria em minúsculas (sempre da categoria atual)."""
+        return self.category.value.lower()
 
 
 class RoutingDecision(BaseModel):
@@ -117,7 +127,7 @@ class RoutingDecision(BaseModel):
     priority: Priority = Field(..., description="Prioridade definida")
     justification: str = Field(..., description="Justificativa do roteamento")
     sla_hours: int = Field(..., description="SLA em horas")
-    routed_at: datetime = Field(default_factory=datetime.utcnow)
+    routed_at: datetime = Field(default_factory=utc_now)
 
 
 class TicketInfo(BaseModel):
@@ -128,7 +138,7 @@ class TicketInfo(BaseModel):
     jira_key: str = Field(..., description="Key do ticket (ex: SUPORTE-123)")
     jira_link: str = Field(..., description="Link para o ticket")
     status: str = Field(default="Open")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
 
 
 class NotificationInfo(BaseModel):
@@ -138,7 +148,7 @@ class NotificationInfo(BaseModel):
     ticket_id: str
     email_to: str
     email_subject: str
-    sent_at: datetime = Field(default_factory=datetime.utcnow)
+    sent_at: datetime = Field(default_factory=utc_now)
     status: Literal["sent", "failed"] = "sent"
 
 
@@ -153,8 +163,10 @@ class ComplaintState(BaseModel):
     notification_info: Optional[NotificationInfo] = None
     workflow_status: WorkflowStatus = WorkflowStatus.NEW
     errors: List[str] = Field(default_factory=list)
-    started_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: datetime = Field(default_factory=utc_now)
     completed_at: Optional[datetime] = None
+    # Times pré-buscados no RAG antes da análise (só em memória, não persiste)
+    team_candidates: List["TeamInfo"] = Field(default_factory=list, exclude=True)
 
 
 class TeamInfo(BaseModel):
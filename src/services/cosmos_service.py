@@ -3,9 +3,11 @@ Serviço de persistência no Azure Cosmos DB.
 Gerencia operações CRUD para reclamações e log de auditoria.
 """
 
+import asyncio
 import logging
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 
 from azure.cosmos import CosmosClient, PartitionKey, exceptions
 from azure.cosmos.container import ContainerProxy
@@ -16,6 +18,9 @@ from src.models.schemas import ComplaintState, WorkflowStatus
 
 logger = logging.getLogger(__name__)
 
+# Campos de c._metadata que podem ser agregados por count_by_field
+COUNTABLE_METADATA_FIELDS = frozenset({"status", "category", "team"})
+
 
 class CosmosService:
     """
@@ -46,10 +51,11 @@ class CosmosService:
         self.logger.info("Initializing Cosmos DB connection...")
 
         try:
-            # Cria cliente
+            # Cria cliente (regiões preferidas evitam latência cross-region)
             self._client = CosmosClient(
                 url=settings.cosmos_endpoint,
                 credential=settings.cosmos_key,
+                preferred_locations=settings.cosmos_preferred_locations or None,
             )
 
             # Cria/obtém database
@@ -73,6 +79,10 @@ class CosmosService:
             )
             self.logger.info("Container 'audit_log' ready")
 
+            # Os create_*_if_not_exists acima já leem database e containers,
+            # então autenticação, descoberta de endpoints e cache de rotas
+            # ficam aquecidos aqui e a primeira reclamação não paga esse custo.
+
             self._initialized = True
             self.logger.info("Cosmos DB initialized successfully")
 
@@ -97,7 +107,10 @@ class CosmosService:
         """
         complaint_id = state.complaint_raw.id or state.complaint_raw.external_id
 
-        # Serializa para dict usando Pydantic
+        # Serializa para dict usando Pydantic. mode="json" já converte enums e
+        # datetimes no pydantic-core; o SDK do Cosmos exige o corpo como dict e
+        # faz ele mesmo o json.dumps final, então um encoder próprio (orjson)
+        # não teria onde ser plugado.
         doc = state.model_dump(mode="json")
 
         # Adiciona campos obrigatórios do Cosmos
@@ -110,7 +123,7 @@ class CosmosService:
             "category": state.complaint_analyzed.category.value if state.complaint_analyzed else None,
             "team": state.routing_decision.team if state.routing_decision else None,
             "created_at": state.started_at.isoformat() if state.started_at else None,
-            "updated_at": datetime.utcnow().isoformat(),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
         }
 
         return doc
@@ -153,8 +166,9 @@ class CosmosService:
         doc = self._state_to_document(state)
 
         try:
-            # Upsert para criar ou atualizar
-            self._complaints_container.upsert_item(doc)
+            # Upsert para criar ou atualizar (SDK síncrono: roda em thread
+            # para que saves concorrentes não bloqueiem o event loop)
+            await asyncio.to_thread(self._complaints_container.upsert_item, doc)
             self.logger.info(f"Saved complaint {complaint_id} to Cosmos DB")
 
             # Log de auditoria
@@ -186,21 +200,28 @@ class CosmosService:
         """
         self._ensure_initialized()
 
+        # Leituras em thread (SDK síncrono): requisições concorrentes não
+        # ficam enfileiradas atrás de uma leitura bloqueando o event loop
         try:
             if source:
                 # Query com partition key (mais eficiente)
-                doc = self._complaints_container.read_item(
+                doc = await asyncio.to_thread(
+                    self._complaints_container.read_item,
                     item=complaint_id,
-                    partition_key=source
+                    partition_key=source,
                 )
             else:
                 # Cross-partition query (mais lento, mas funciona sem saber a fonte)
                 query = "SELECT * FROM c WHERE c.id = @id"
-                items = list(self._complaints_container.query_items(
-                    query=query,
-                    parameters=[{"name": "@id", "value": complaint_id}],
-                    enable_cross_partition_query=True
-                ))
+
+                def run_query() -> List[Dict[str, Any]]:
+                    return list(self._complaints_container.query_items(
+                        query=query,
+                        parameters=[{"name": "@id", "value": complaint_id}],
+                        enable_cross_partition_query=True
+                    ))
+
+                items = await asyncio.to_thread(run_query)
                 if not items:
                     return None
                 doc = items[0]
@@ -214,6 +235,39 @@ class CosmosService:
             self.logger.error(f"Failed to get complaint {complaint_id}: {e.message}")
             raise
 
+    async def bulk_exists(self, complaint_ids: List[str]) -> Set[str]:
+        """
+        Verifica quais reclamações existem, com uma única query.
+
+        Args:
+            complaint_ids: IDs das reclamações
+
+        Returns:
+            Conjunto com os IDs encontrados
+        """
+        self._ensure_initialized()
+
+        if not complaint_ids:
+            return set()
+
+        # Uma query cross-partition em vez de N leituras individuais
+        query = "SELECT VALUE c.id FROM c WHERE ARRAY_CONTAINS(@ids, c.id)"
+
+        def run_query() -> Set[str]:
+            return set(self._complaints_container.query_items(
+                query=query,
+                parameters=[{"name": "@ids", "value": list(complaint_ids)}],
+                enable_cross_partition_query=True,
+            ))
+
+        try:
+            # SDK síncrono: roda em thread para não bloquear o event loop
+            return await asyncio.to_thread(run_query)
+
+        except exceptions.CosmosHttpResponseError as e:
+            self.logger.error(f"Failed to check complaints existence: {e.message}")
+            raise
+
     async def list_complaints(
         self,
         source: Optional[str] = None,
@@ -235,6 +289,86 @@ class CosmosService:
         """
         self._ensure_initialized()
 
+        query, parameters = self._build_list_query(source, status, limit, offset)
+
+        try:
+            items = list(self._complaints_container.query_items(
+                query=query,
+                parameters=parameters,
+                enable_cross_partition_query=(source is None),
+            ))
+
+            return [self._document_to_state(doc) for doc in items]
+
+        except exceptions.CosmosHttpResponseError as e:
+            self.logger.error(f"Failed to list complaints: {e.message}")
+            raise
+
+    async def iter_complaints(
+        self,
+        source: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> AsyncIterator[ComplaintState]:
+        """
+        Itera reclamações página a página, com os mesmos filtros de list_complaints.
+
+        Cada página é buscada em thread (SDK síncrono) e entregue assim que
+        chega, sem montar a lista completa.
+
+        Args:
+            source: Filtrar por fonte
+            status: Filtrar por status do workflow
+            limit: Número máximo de resultados
+            offset: Offset para paginação
+
+        Yields:
+            ComplaintState de cada documento
+        """
+        self._ensure_initialized()
+
+        query, parameters = self._build_list_query(source, status, limit, offset)
+        pages = self._complaints_container.query_items(
+            query=query,
+            parameters=parameters,
+            enable_cross_partition_query=(source is None),
+        ).by_page()
+
+        def next_page() -> Optional[List[Dict[str, Any]]]:
+            try:
+                return list(next(pages))
+            except StopIteration:
+                return None
+
+        try:
+            while (page := await asyncio.to_thread(next_page)) is not None:
+                for doc in page:
+                    yield self._document_to_state(doc)
+
+        except exceptions.CosmosHttpResponseError as e:
+            self.logger.error(f"Failed to iterate complaints: {e.message}")
+            raise
+
+    @staticmethod
+    def _build_list_query(
+        source: Optional[str],
+        status: Optional[str],
+        limit: int,
+        offset: int,
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Monta a query de listagem de reclamações.
+
+        Args:
+            source: Filtrar por fonte
+            status: Filtrar por status do workflow
+            limit: Número máximo de resultados
+            offset: Offset para paginação
+
+        Returns:
+            Tupla (query, parâmetros)
+        """
         # Constrói query dinamicamente
         conditions = []
         parameters = []
@@ -250,18 +384,7 @@ class CosmosService:
         where_clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
         query = f"SELECT * FROM c{where_clause} ORDER BY c._metadata.updated_at DESC OFFSET {offset} LIMIT {limit}"
 
-        try:
-            items = list(self._complaints_container.query_items(
-                query=query,
-                parameters=parameters,
-                enable_cross_partition_query=(source is None),
-            ))
-
-            return [self._document_to_state(doc) for doc in items]
-
-        except exceptions.CosmosHttpResponseError as e:
-            self.logger.error(f"Failed to list complaints: {e.message}")
-            raise
+        return query, parameters
 
     async def update_status(self, complaint_id: str, status: str, source: str = None) -> bool:
         """
@@ -286,7 +409,7 @@ class CosmosService:
             # Atualiza status
             state.workflow_status = WorkflowStatus(status)
             if status == WorkflowStatus.COMPLETED.value:
-                state.completed_at = datetime.utcnow()
+                state.completed_at = datetime.now(timezone.utc)
 
             # Salva
             await self.save_complaint(state)
@@ -320,7 +443,7 @@ class CosmosService:
         """
         self._ensure_initialized()
 
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
         date_str = now.strftime("%Y-%m-%d")
 
         event_doc = {
@@ -333,7 +456,7 @@ class CosmosService:
         }
 
         try:
-            self._audit_container.create_item(event_doc)
+            await asyncio.to_thread(self._audit_container.create_item, event_doc)
             self.logger.debug(f"Logged event {event_type} for complaint {complaint_id}")
 
         except exceptions.CosmosHttpResponseError as e:
@@ -442,6 +565,45 @@ class CosmosService:
             self.logger.error(f"Failed to get stats: {e.message}")
             return {"total": 0, "by_status": {}, "by_source": {}}
 
+    async def count_by_field(self, field: str) -> Dict[str, int]:
+        """
+        Conta reclamações agrupadas por um campo de c._metadata.
+
+        A query projeta só o campo (SELECT VALUE) e a contagem é feita aqui:
+        trafega um valor por documento em vez do documento inteiro, sem o
+        GROUP BY cross-partition.
+
+        Args:
+            field: Campo de c._metadata ("status", "category" ou "team")
+
+        Returns:
+            Dict valor -> quantidade (documentos sem o campo são ignorados)
+        """
+        self._ensure_initialized()
+
+        if field not in COUNTABLE_METADATA_FIELDS:
+            raise ValueError(f"Field not countable: {field}")
+
+        query = f"SELECT VALUE c._metadata.{field} FROM c"
+
+        def run_query() -> Dict[str, int]:
+            return dict(Counter(
+                value
+                for value in self._complaints_container.query_items(
+                    query=query,
+                    enable_cross_partition_query=True,
+                )
+                if value
+            ))
+
+        try:
+            # SDK síncrono: roda em thread para não bloquear o event loop
+            return await asyncio.to_thread(run_query)
+
+        except exceptions.CosmosHttpResponseError as e:
+            self.logger.error(f"Failed to count complaints by {field}: {e.message}")
+            raise
+
     def is_initialized(self) -> bool:
         """Retorna se o serviço está inicializado."""
         return self._initialized
@@ -3,16 +3,30 @@ Carregador de dados mock para desenvolvimento.
 Lê dados das 5 fontes de reclamações simuladas.
 """
 
-import json
+import functools
 import uuid
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import orjson
+
 from src.core.config import get_settings
 from src.models.schemas import ComplaintRaw, ComplaintSource, TeamInfo
 
 
+# Arquivo mock de cada fonte (chat e WhatsApp compartilham o mesmo arquivo)
+SOURCE_FILES: Dict[ComplaintSource, str] = {
+    ComplaintSource.RECLAME_AQUI: "reclame_aqui.json",
+    ComplaintSource.JIRA: "jira_issues.json",
+    ComplaintSource.CHAT: "chat_transcripts.json",
+    ComplaintSource.WHATSAPP: "chat_transcripts.json",
+    ComplaintSource.PHONE: "phone_transcripts.json",
+    ComplaintSource.EMAIL: "support_emails.json",
+}
+
+
 class MockDataLoader:
     """Carrega dados mock dos arquivos JSON."""
 
@@ -53,19 +67,44 @@ class MockDataLoader:
         if filename in self._cache:
             return self._cache[filename]
 
-        file_path = self.data_path / filename
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
+        data = self._read_json(filename)
         self._cache[filename] = data
         return data
 
+    def _read_json(self, filename: str) -> Dict[str, Any]:
+        """Lê e decodifica um arquivo JSON da pasta de dados (sem cache)."""
+        file_path = self.data_path / filename
+        return orjson.loads(file_path.read_bytes())
+
+    def _prefetch(self, filenames: List[str]) -> None:
+        """
+        Lê em paralelo os arquivos ainda fora do cache.
+
+        As fontes são independentes, então a leitura fria fica limitada
+        pelo arquivo mais lento em vez da soma de todos.
+
+        Args:
+            filenames: Arquivos que serão usados em seguida
+        """
+        pending = [f for f in dict.fromkeys(filenames) if f not in self._cache]
+        if len(pending) < 2:
+            return
+
+        with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+            for filename, data in zip(pending, pool.map(self._read_json, pending)):
+                self._cache[filename] = data
+
     def _parse_datetime(self, dt_string: str) -> datetime:
         """Parse datetime string para objeto datetime."""
         try:
-            return datetime.fromisoformat(dt_string.replace("Z", "+00:00"))
+            parsed = datetime.fromisoformat(dt_string.replace("Z", "+00:00"))
         except (ValueError, AttributeError):
-            return datetime.utcnow()
+            return datetime.now(timezone.utc)
+
+        # Datas sem fuso nos mocks são tratadas como UTC
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed
 
     def load_reclame_aqui(self) -> List[ComplaintRaw]:
         """
@@ -79,7 +118,7 @@ class MockDataLoader:
 
         for item in data.get("complaints", []):
             complaint = ComplaintRaw(
-                id=str(uuid.uuid4()),
+                id=uuid.uuid4().hex,
                 external_id=item["external_id"],
                 source=ComplaintSource.RECLAME_AQUI,
                 company_name=data.get("company", {}).get("name", "TechNova Store"),
@@ -109,7 +148,7 @@ class MockDataLoader:
 
         for item in data.get("issues", []):
             complaint = ComplaintRaw(
-                id=str(uuid.uuid4()),
+                id=uuid.uuid4().hex,
                 external_id=item["external_id"],
                 source=ComplaintSource.JIRA,
                 company_name="TechNova Store",
@@ -137,7 +176,7 @@ class MockDataLoader:
         for item in data.get("transcripts", []):
             source = ComplaintSource.WHATSAPP if item.get("channel") == "WhatsApp" else ComplaintSource.CHAT
             complaint = ComplaintRaw(
-                id=str(uuid.uuid4()),
+                id=uuid.uuid4().hex,
                 external_id=item["external_id"],
                 source=source,
                 company_name="TechNova Store",
@@ -167,7 +206,7 @@ class MockDataLoader:
 
         for item in data.get("transcripts", []):
             complaint = ComplaintRaw(
-                id=str(uuid.uuid4()),
+                id=uuid.uuid4().hex,
                 external_id=item["external_id"],
                 source=ComplaintSource.PHONE,
                 company_name="TechNova Store",
@@ -197,7 +236,7 @@ class MockDataLoader:
 
         for item in data.get("emails", []):
             complaint = ComplaintRaw(
-                id=str(uuid.uuid4()),
+                id=uuid.uuid4().hex,
                 external_id=item["external_id"],
                 source=ComplaintSource.EMAIL,
                 company_name="TechNova Store",
@@ -239,6 +278,10 @@ class MockDataLoader:
             ComplaintSource.EMAIL: self.load_support_emails,
         }
 
+        # Aquece o cache lendo os arquivos das fontes em paralelo
+        selected = sources or list(SOURCE_FILES)
+        self._prefetch([SOURCE_FILES[s] for s in selected if s in SOURCE_FILES])
+
         if sources:
             for source in sources:
                 if source in source_loaders:
@@ -315,18 +358,12 @@ class MockDataLoader:
         self._cache.clear()
 
 
-# Factory function
-_loader: Optional[MockDataLoader] = None
-
-
+@functools.cache
 def get_data_loader() -> MockDataLoader:
     """
     Factory function para obter o loader.
 
     Returns:
-        Instância do MockDataLoader
+        Instância singleton do MockDataLoader (criada uma única vez)
     """
-    global _loader
-    if _loader is None:
-        _loader = MockDataLoader()
-    return _loader
+    return MockDataLoader()
@@ -6,7 +6,7 @@ Versão simplificada sem LangGraph para compatibilidade com Python 3.8.
 import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, AsyncIterator, Dict, List, Optional, TYPE_CHECKING
 
 from src.agents import (
     get_analyst_agent,
@@ -83,12 +83,12 @@ class ComplaintOrchestrator:
         self.router = get_router_agent(use_azure_search=self.use_azure_search)
         self.communicator = get_communicator_agent()
 
-        # Inicializa cada agente
-        await self.collector.initialize()
-        await self.privacy.initialize()
-        await self.analyst.initialize()
-        await self.router.initialize()
-        await self.communicator.initialize()
+        # Inicializa cada agente (marcando-os, para execute() não repetir)
+        await self.collector.ensure_initialized()
+        await self.privacy.ensure_initialized()
+        await self.analyst.ensure_initialized()
+        await self.router.ensure_initialized()
+        await self.communicator.ensure_initialized()
 
         # Inicializa Cosmos DB se persistência habilitada
         if self.enable_persistence:
@@ -171,9 +171,10 @@ class ComplaintOrchestrator:
         """
         complaint_id = state.complaint_raw.id or state.complaint_raw.external_id
 
-        # Step 1: Anonymize (LGPD compliance)
+        # Step 1: Anonymize (LGPD compliance) - já feito se veio de um lote
         self.logger.debug(f"Step 1: Anonymizing complaint {complaint_id}")
-        state = await self.privacy.process_state(state)
+        if state.complaint_anonymized is None:
+            state = await self.privacy.process_state(state)
         await self._save_state(state, "anonymize")
 
         # Step 2: Analyze (using anonymized data)
@@ -206,6 +207,7 @@ class ComplaintOrchestrator:
         complaints: Optional[List[ComplaintRaw]] = None,
         limit: Optional[int] = None,
         source_filter: Optional[str] = None,
+        concurrency: int = 1,
     ) -> List[ComplaintState]:
         """
         Processa lote de reclamações.
@@ -214,57 +216,166 @@ class ComplaintOrchestrator:
             complaints: Lista de reclamações ou None para carregar do mock
             limit: Limite de reclamações a processar
             source_filter: Filtro por fonte (ex: "reclame_aqui")
+            concurrency: Máximo de reclamações processadas ao mesmo tempo
 
         Returns:
-            Lista de ComplaintState finais
+            Lista de ComplaintState finais (na ordem de entrada)
+        """
+        tasks = await self._start_batch(complaints, limit, source_filter, concurrency)
+
+        try:
+            return list(await asyncio.gather(*tasks))
+        finally:
+            # Chamador cancelado: cancela o que ainda não terminou
+            for task in tasks:
+                task.cancel()
+
+    async def stream_batch(
+        self,
+        complaints: Optional[List[ComplaintRaw]] = None,
+        limit: Optional[int] = None,
+        source_filter: Optional[str] = None,
+        concurrency: int = 1,
+    ) -> AsyncIterator[ComplaintState]:
+        """
+        Processa lote de reclamações entregando cada resultado assim que fica pronto.
+
+        Até `concurrency` reclamações são processadas ao mesmo tempo; o limite
+        evita estourar o rate limit do Azure OpenAI e, como os resultados saem
+        por ordem de conclusão, uma chamada lenta não segura as demais.
+
+        Args:
+            complaints: Lista de reclamações ou None para carregar do mock
+            limit: Limite de reclamações a processar
+            source_filter: Filtro por fonte (ex: "reclame_aqui")
+            concurrency: Máximo de reclamações processadas ao mesmo tempo
+
+        Yields:
+            ComplaintState final de cada reclamação
+        """
+        tasks = await self._start_batch(complaints, limit, source_filter, concurrency)
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumidor abandonou o stream: cancela o que ainda não terminou
+            for task in tasks:
+                task.cancel()
+
+    async def _start_batch(
+        self,
+        complaints: Optional[List[ComplaintRaw]],
+        limit: Optional[int],
+        source_filter: Optional[str],
+        concurrency: int,
+    ) -> List["asyncio.Task[ComplaintState]"]:
+        """
+        Prepara e anonimiza o lote e agenda o processamento de cada reclamação.
+
+        Args:
+            complaints: Lista de reclamações ou None para carregar do mock
+            limit: Limite de reclamações a processar
+            source_filter: Filtro por fonte (ex: "reclame_aqui")
+            concurrency: Máximo de reclamações processadas ao mesmo tempo
+
+        Returns:
+            Tasks na ordem de entrada do lote
         """
         if not self._initialized:
             await self.initialize()
 
+        states = await self._prepare_batch(complaints, limit, source_filter)
+
+        # Anonimiza o lote inteiro de uma vez (uma passada de regex)
+        states = await self.privacy.process_states(states)
+
+        self.logger.info(
+            f"Processing batch of {len(states)} complaints "
+            f"(concurrency: {concurrency})"
+        )
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run_one(i: int, state: ComplaintState) -> ComplaintState:
+            async with semaphore:
+                return await self._process_batch_item(i, len(states), state)
+
+        return [
+            asyncio.create_task(run_one(i, state))
+            for i, state in enumerate(states)
+        ]
+
+    async def _process_batch_item(
+        self,
+        index: int,
+        total: int,
+        state: ComplaintState,
+    ) -> ComplaintState:
+        """
+        Processa uma reclamação do lote sem propagar falhas.
+
+        Args:
+            index: Posição da reclamação no lote
+            total: Tamanho do lote
+            state: Estado inicial da reclamação
+
+        Returns:
+            ComplaintState final (com status de falha em caso de erro)
+        """
+        try:
+            self.logger.info(
+                f"Processing {index+1}/{total}: "
+                f"{state.complaint_raw.id or state.complaint_raw.external_id}"
+            )
+
+            result = await self._execute_workflow(state)
+
+            self._update_stats(result)
+            return result
+
+        except Exception as e:
+            self.logger.error(f"Failed to process complaint: {e}")
+            state.workflow_status = WorkflowStatus.FAILED_LLM
+            state.errors.append(str(e))
+            self._update_stats(state)
+            return state
+
+    async def _prepare_batch(
+        self,
+        complaints: Optional[List[ComplaintRaw]],
+        limit: Optional[int],
+        source_filter: Optional[str],
+    ) -> List[ComplaintState]:
+        """
+        Monta os estados iniciais do lote.
+
+        Args:
+            complaints: Lista de reclamações ou None para carregar do mock
+            limit: Limite de reclamações a processar
+            source_filter: Filtro por fonte (ex: "reclame_aqui")
+
+        Returns:
+            Lista de ComplaintState iniciais
+        """
         # Carrega reclamações se não fornecidas
         if complaints is None:
-            states = await self.collector.execute(None)
-
-            # Aplica filtro de fonte se especificado
-            if source_filter:
-                states = [
-                    s for s in states
-                    if s.complaint_raw.source.value == source_filter
-                ]
-
-            # Aplica limite
-            if limit:
-                states = states[:limit]
+            # Consome o coletor em stream, aplicando filtro e limite na
+            # entrada: para de criar estados assim que o limite é atingido
+            states = []
+            async for state in self.collector.stream():
+                if source_filter and state.complaint_raw.source.value != source_filter:
+                    continue
+                states.append(state)
+                if limit and len(states) >= limit:
+                    break
         else:
             states = [
                 await self.collector.collect_single(c)
                 for c in (complaints[:limit] if limit else complaints)
             ]
 
-        self.logger.info(f"Processing batch of {len(states)} complaints")
-
-        # Processa cada reclamação
-        results = []
-        for i, state in enumerate(states):
-            try:
-                self.logger.info(
-                    f"Processing {i+1}/{len(states)}: "
-                    f"{state.complaint_raw.id or state.complaint_raw.external_id}"
-                )
-
-                result = await self._execute_workflow(state)
-
-                self._update_stats(result)
-                results.append(result)
-
-            except Exception as e:
-                self.logger.error(f"Failed to process complaint: {e}")
-                state.workflow_status = WorkflowStatus.FAILED_LLM
-                state.errors.append(str(e))
-                results.append(state)
-                self._update_stats(state)
-
-        return results
+        return states
 
     def _update_stats(self, state: ComplaintState) -> None:
         """Atualiza estatísticas internas."""
@@ -3,10 +3,12 @@ Prompts centralizados para o LLM.
 Define templates de prompts para classificação de reclamações.
 """
 
-from typing import Optional
+from typing import Final, Optional
 
 
-SYSTEM_PROMPT_ANALYST = """Você é um analista especializado em reclamações de e-commerce brasileiro.
+# Conteúdo fixo: todas as chamadas enviam exatamente o mesmo prefixo ao LLM,
+# o que permite o reaproveitamento de prompt caching do Azure OpenAI.
+SYSTEM_PROMPT_ANALYST: Final[str] = """Você é um analista especializado em reclamações de e-commerce brasileiro.
 Sua função é classificar reclamações com precisão e objetividade.
 
 CATEGORIAS VÁLIDAS (use EXATAMENTE uma dessas):
@@ -105,7 +107,11 @@ class PromptTemplates:
 
     @staticmethod
     def get_system_prompt() -> str:
-        """Retorna o system prompt para o analista."""
+        """
+        Retorna o system prompt para o analista.
+
+        Devolve sempre a mesma constante do módulo (nada é recalculado por chamada).
+        """
         return SYSTEM_PROMPT_ANALYST
 
     @staticmethod
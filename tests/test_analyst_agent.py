@@ -0,0 +1,53 @@
+"""
+Testes para o AnalystAgent.
+Verifica a conversão das respostas do LLM em categorias.
+"""
+
+import pytest
+import sys
+import os
+
+# Add project root to path to avoid circular imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.schemas import ComplaintCategory
+
+
+@pytest.fixture
+def analyst_agent(monkeypatch):
+    """Fixture para o agente analista (sem configuração do LangSmith)."""
+    from src.agents import analyst
+
+    monkeypatch.setattr(analyst, "get_langsmith_config", lambda: None)
+    return analyst.AnalystAgent()
+
+
+class TestCategoryParsing:
+    """Testes para o mapeamento de categorias."""
+
+    def test_exact_category(self, analyst_agent):
+        """Testa categoria idêntica a uma chave do mapeamento."""
+        assert analyst_agent._parse_category("Cobrança Indevida") == ComplaintCategory.COBRANCA_INDEVIDA
+
+    @pytest.mark.parametrize("answer,expected", [
+        ("cobrança", ComplaintCategory.COBRANCA_INDEVIDA),
+        ("atraso", ComplaintCategory.ATRASO_ENTREGA),
+        ("diferente", ComplaintCategory.PRODUTO_DIFERENTE),
+        ("vendedor", ComplaintCategory.PROBLEMA_VENDEDOR),
+    ])
+    def test_abbreviated_category(self, analyst_agent, answer, expected):
+        """Testa resposta abreviada (texto contido em uma chave)."""
+        assert analyst_agent._parse_category(answer) == expected
+
+    @pytest.mark.parametrize("answer,expected", [
+        ("cancelamento negado por defeito", ComplaintCategory.PRODUTO_DEFEITO),
+        ("reembolso ou atraso na entrega", ComplaintCategory.ATRASO_ENTREGA),
+        ("marketplace com cobrança indevida", ComplaintCategory.COBRANCA_INDEVIDA),
+    ])
+    def test_multiple_categories_use_mapping_order(self, analyst_agent, answer, expected):
+        """Testa que, com várias categorias no texto, vence a primeira do mapeamento."""
+        assert analyst_agent._parse_category(answer) == expected
+
+    def test_unknown_category_fallback(self, analyst_agent):
+        """Testa fallback para categoria desconhecida."""
+        assert analyst_agent._parse_category("xyz") == ComplaintCategory.ATENDIMENTO_RUIM
@@ -0,0 +1,64 @@
+"""
+Testes para o AzureOpenAIClient.
+Verifica o desempacotamento das respostas de análise em lote.
+"""
+
+import pytest
+import sys
+import os
+
+# Add project root to path to avoid circular imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.integrations.azure_openai import AzureOpenAIClient, LLMError
+
+
+@pytest.fixture
+def make_client():
+    """Fixture que cria um client cujo analyze devolve uma resposta fixa."""
+    def _make(response):
+        # Sem __init__: não cria os clients do Azure nem lê configurações
+        client = AzureOpenAIClient.__new__(AzureOpenAIClient)
+
+        async def analyze(*args, **kwargs):
+            return response
+
+        client.analyze = analyze
+        return client
+    return _make
+
+
+class TestAnalyzeMarshaled:
+    """Testes para a análise em lote numa única chamada."""
+
+    @pytest.mark.asyncio
+    async def test_results_follow_prompt_order(self, make_client):
+        """Testa que os resultados voltam na ordem dos prompts."""
+        client = make_client({"results": [{"id": 1, "v": "b"}, {"id": 0, "v": "a"}]})
+
+        results = await client.analyze_marshaled("sys", ["p0", "p1"])
+
+        assert results == [{"v": "a"}, {"v": "b"}]
+
+    @pytest.mark.asyncio
+    async def test_missing_item_becomes_error(self, make_client):
+        """Testa que item ausente na resposta vira {"error": ...}."""
+        client = make_client({"results": [{"id": 0, "v": "a"}]})
+
+        results = await client.analyze_marshaled("sys", ["p0", "p1"])
+
+        assert results[0] == {"v": "a"}
+        assert "error" in results[1]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("response", [
+        [{"id": 0, "v": "a"}],
+        {"results": {"id": 0}},
+        {"v": "a"},
+    ])
+    async def test_unexpected_shape_raises(self, make_client, response):
+        """Testa que resposta fora do formato esperado gera LLMError."""
+        client = make_client(response)
+
+        with pytest.raises(LLMError):
+            await client.analyze_marshaled("sys", ["p0"])
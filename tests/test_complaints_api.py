@@ -0,0 +1,79 @@
+"""
+Testes para a rota de listagem de reclamações.
+Verifica o tratamento de erros no modo stream (NDJSON).
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timezone
+
+# Add project root to path to avoid circular imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routes import complaints
+from src.models.schemas import ComplaintRaw, ComplaintSource, ComplaintState
+
+
+def _make_state(external_id: str) -> ComplaintState:
+    """Cria um estado mínimo de reclamação."""
+    return ComplaintState(
+        complaint_raw=ComplaintRaw(
+            external_id=external_id,
+            source=ComplaintSource.CHAT,
+            title="Cobrança duplicada",
+            description="Fui cobrado duas vezes",
+            consumer_name="Cliente",
+            created_at=datetime.now(timezone.utc),
+            channel="web",
+        )
+    )
+
+
+class FakeCosmos:
+    """Cosmos falso que falha após entregar `fail_after` reclamações."""
+
+    def __init__(self, fail_after: int):
+        self.fail_after = fail_after
+
+    def is_initialized(self) -> bool:
+        return True
+
+    async def iter_complaints(self, **kwargs):
+        for i in range(self.fail_after):
+            yield _make_state(f"EXT-{i}")
+        raise RuntimeError("cosmos unavailable")
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    """Fixture que monta a API com um Cosmos falso."""
+    def _make(cosmos: FakeCosmos) -> TestClient:
+        monkeypatch.setattr(complaints, "get_cosmos_service", lambda: cosmos)
+        app = FastAPI()
+        app.include_router(complaints.router)
+        return TestClient(app)
+    return _make
+
+
+class TestStreamErrors:
+    """Testes para falhas durante a listagem em stream."""
+
+    def test_failure_before_first_item_returns_500(self, make_client):
+        """Testa que falha na primeira página vira HTTP 500."""
+        client = make_client(FakeCosmos(fail_after=0))
+
+        response = client.get("/complaints", params={"stream": True})
+
+        assert response.status_code == 500
+        assert "cosmos unavailable" in response.json()["detail"]
+
+    def test_failure_mid_stream_is_not_swallowed(self, make_client):
+        """Testa que falha após o início do stream aborta a resposta."""
+        client = make_client(FakeCosmos(fail_after=2))
+
+        with pytest.raises(RuntimeError, match="cosmos unavailable"):
+            client.get("/complaints", params={"stream": True})
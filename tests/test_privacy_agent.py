@@ -335,6 +335,70 @@ class TestMixedPII:
         assert result.description == original_description
 
 
+class TestPatternPriority:
+    """Testes para a ordem de aplicação dos padrões (cartão, CPF, email, telefone)."""
+
+    # Entradas em que um padrão genérico casando antes no texto consumiria
+    # dígitos do cartão/CPF se os padrões fossem aplicados juntos
+    OVERLAP_CASES = [
+        ("4110212249 465098838 34", "41[CARTÃO REMOVIDO]8 34"),
+        ("29(787620741763", "29([CPF REMOVIDO]3"),
+        ("4719-12)675316132798a(71", "4719-12)[CPF REMOVIDO]8a(71"),
+    ]
+
+    @pytest.mark.parametrize("text,expected", OVERLAP_CASES)
+    def test_specific_patterns_win_over_earlier_phone(self, privacy_agent, text, expected):
+        """Testa que cartão e CPF são mascarados antes do telefone."""
+        assert privacy_agent._mask_pii(text) == (expected, 1)
+
+    def test_batch_matches_single_on_overlaps(self, privacy_agent):
+        """Testa que o lote aplica os padrões na mesma ordem."""
+        texts = [text for text, _ in self.OVERLAP_CASES]
+
+        assert privacy_agent.mask_many(texts) == [
+            privacy_agent._mask_pii(text) for text in texts
+        ]
+
+
+class TestUnicodeInput:
+    """Testes para PII com separadores e dígitos Unicode."""
+
+    def test_phone_with_nbsp(self, privacy_agent):
+        """Testa telefone separado por espaço não separável (NBSP)."""
+        masked, count = privacy_agent._mask_pii("Ligue (11)\u00a098765-4321")
+
+        assert masked == "Ligue [TELEFONE REMOVIDO]"
+        assert count == 1
+
+    def test_card_with_nbsp(self, privacy_agent):
+        """Testa cartão com grupos separados por NBSP."""
+        masked, count = privacy_agent._mask_pii(
+            "Cartão 1234\u00a05678\u00a09012\u00a03456"
+        )
+
+        assert masked == "Cartão [CARTÃO REMOVIDO]"
+        assert count == 1
+
+    def test_cpf_with_fullwidth_digits(self, privacy_agent):
+        """Testa CPF escrito com dígitos de largura total."""
+        masked, count = privacy_agent._mask_pii("CPF １２３.４５６.７８９-００")
+
+        assert masked == "CPF [CPF REMOVIDO]"
+        assert count == 1
+
+    def test_batch_masks_unicode_input(self, privacy_agent):
+        """Testa que o lote mascara as mesmas entradas Unicode."""
+        results = privacy_agent.mask_many([
+            "Ligue (11)\u00a098765-4321",
+            "CPF １２３.４５６.７８９-００",
+        ])
+
+        assert results == [
+            ("Ligue [TELEFONE REMOVIDO]", 1),
+            ("CPF [CPF REMOVIDO]", 1),
+        ]
+
+
 class TestProcessState:
     """Testes para processamento de ComplaintState."""
 
@@ -372,6 +436,45 @@ class TestProcessState:
         assert result.description != original_description
 
 
+class TestBatchProcessing:
+    """Testes para anonimização em lote."""
+
+    @pytest.mark.asyncio
+    async def test_process_many_matches_single(self, privacy_agent, sample_complaint):
+        """Testa que o lote produz o mesmo resultado que o processamento individual."""
+        clean = sample_complaint.model_copy(update={
+            "external_id": "TEST-002",
+            "description": "Sem dados pessoais aqui",
+            "consumer_contact": None,
+        })
+        phone = sample_complaint.model_copy(update={
+            "external_id": "TEST-003",
+            "description": "Ligue (11) 98765-4321 ou use o cartão 1234 5678 9012 3456",
+        })
+        complaints = [sample_complaint, clean, phone]
+
+        await privacy_agent.initialize()
+        batch = await privacy_agent.process_many(complaints)
+        single = [await privacy_agent.process(c) for c in complaints]
+
+        assert [c.model_dump() for c in batch] == [c.model_dump() for c in single]
+        assert batch[1].description == "Sem dados pessoais aqui"
+        assert "[TELEFONE REMOVIDO]" in batch[2].description
+        assert "[CARTÃO REMOVIDO]" in batch[2].description
+
+    def test_mask_many_counts_per_text(self, privacy_agent):
+        """Testa que as contagens são atribuídas ao texto correto."""
+        results = privacy_agent.mask_many([
+            "CPF 123.456.789-00 e 111.222.333-44",
+            "",
+            "email joao@gmail.com",
+        ])
+
+        assert results[0] == ("CPF [CPF REMOVIDO] e [CPF REMOVIDO]", 2)
+        assert results[1] == ("", 0)
+        assert results[2] == ("email [EMAIL REMOVIDO]", 1)
+
+
 class TestFactoryFunction:
     """Testes para a factory function."""
 
@@ -397,12 +500,12 @@ class TestValidation:
     async def test_validate_input_valid(self, privacy_agent, sample_complaint):
         """Testa validação com entrada válida."""
         await privacy_agent.initialize()
-        result = await privacy_agent.validate_input(sample_complaint)
+        result = privacy_agent.validate_input(sample_complaint)
         assert result is True
 
     @pytest.mark.asyncio
     async def test_validate_input_none(self, privacy_agent):
         """Testa validação com None."""
         await privacy_agent.initialize()
-        result = await privacy_agent.validate_input(None)
+        result = privacy_agent.validate_input(None)
         assert result is False